@@ -13,13 +13,14 @@ from flask_restful import Api
 from metadata_service.api.column import ColumnDescriptionAPI
 from metadata_service.api.healthcheck import healthcheck
 from metadata_service.api.popular_tables import PopularTablesAPI
+from metadata_service.api.representations import output_json
 from metadata_service.api.system import Neo4jDetailAPI
 from metadata_service.api.table \
     import TableDetailAPI, TableOwnerAPI, TableTagAPI, TableDescriptionAPI
 from metadata_service.api.tag import TagAPI
-from metadata_service.api.user import (UserDetailAPI, UserFollowAPI,
-                                       UserFollowsAPI, UserOwnsAPI,
-                                       UserOwnAPI, UserReadsAPI)
+from metadata_service.api.user import (UserDetailAPI, UserFollowBatchAPI,
+                                       UserOwnBatchAPI, UserRelationAPI,
+                                       UserRelationsAPI, UserResourcesAPI)
 
 # For customized flask use below arguments to override.
 FLASK_APP_MODULE_NAME = os.getenv('FLASK_APP_MODULE_NAME')
@@ -75,6 +76,7 @@ def create_app(*, config_module_class: str) -> Flask:
     api_bp.add_url_rule('/healthcheck', 'healthcheck', healthcheck)
 
     api = Api(api_bp)
+    api.representation('application/json')(output_json)
 
     api.add_resource(PopularTablesAPI, '/popular_tables/')
     api.add_resource(TableDetailAPI, '/table/<path:table_uri>')
@@ -93,16 +95,16 @@ def create_app(*, config_module_class: str) -> Flask:
     api.add_resource(UserDetailAPI,
                      '/user',
                      '/user/<path:id>')
-    api.add_resource(UserFollowsAPI,
-                     '/user/<path:user_id>/follow/')
-    api.add_resource(UserFollowAPI,
-                     '/user/<path:user_id>/follow/<resource_type>/<path:table_uri>')
-    api.add_resource(UserOwnsAPI,
-                     '/user/<path:user_id>/own/')
-    api.add_resource(UserOwnAPI,
-                     '/user/<path:user_id>/own/<resource_type>/<path:table_uri>')
-    api.add_resource(UserReadsAPI,
-                     '/user/<path:user_id>/read/')
+    api.add_resource(UserRelationsAPI,
+                     '/user/<path:user_id>/<any(follow, own, read):relation>/')
+    api.add_resource(UserRelationAPI,
+                     '/user/<path:user_id>/<any(follow, own):relation>/<resource_type>/<path:table_uri>')
+    api.add_resource(UserFollowBatchAPI,
+                     '/user/<path:user_id>/follow/<resource_type>/')
+    api.add_resource(UserOwnBatchAPI,
+                     '/user/<path:user_id>/own/<resource_type>/')
+    api.add_resource(UserResourcesAPI,
+                     '/user/<path:user_id>/resources/')
     app.register_blueprint(api_bp)
 
     if app.config.get('SWAGGER_ENABLED'):
@@ -1,4 +1,5 @@
 import logging
+from functools import lru_cache
 from http import HTTPStatus
 from typing import Iterable, Union, Mapping, Any, Optional, List
 
@@ -9,6 +10,15 @@ from metadata_service.proxy import BaseProxy
 LOGGER = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=None)
+def _get_schema(schema: Any, many: bool) -> Any:
+    """
+    Resources are instantiated per request, so schema instances are kept here instead:
+    building a marshmallow schema copies and binds all of its declared fields.
+    """
+    return schema(many=many)
+
+
 class BaseAPI(Resource):
     def __init__(self, schema: Any, str_type: str, client: BaseProxy) -> None:
         self.schema = schema
@@ -26,11 +36,11 @@ class BaseAPI(Resource):
                 actual_id: Union[str, int] = int(id) if id.isdigit() else id
                 object = get_object(id=actual_id)
                 if object is not None:
-                    return self.schema().dump(object).data, HTTPStatus.OK
+                    return _get_schema(self.schema, False).dump(object).data, HTTPStatus.OK
                 return None, HTTPStatus.NOT_FOUND
             except ValueError as e:
                 return {'message': f'exception:{e}'}, HTTPStatus.BAD_REQUEST
         else:
             get_objects = getattr(self.client, f'get_{self.str_type}s')
             objects: List[Any] = get_objects()
-            return self.schema(many=True).dump(objects).data, HTTPStatus.OK
+            return _get_schema(self.schema, True).dump(objects).data, HTTPStatus.OK
@@ -1,4 +1,5 @@
 from http import HTTPStatus
+from types import MappingProxyType
 from typing import Iterable, Union, Mapping
 
 from flask import request
@@ -7,17 +8,18 @@ from flasgger import swag_from
 
 from metadata_service.proxy import get_proxy_client
 
-popular_table_fields = {
+# Read-only as it is shared with the user resources (see api/user.py)
+popular_table_fields = MappingProxyType({
     'database': fields.String,
     'cluster': fields.String,
     'schema': fields.String,
     'table_name': fields.String(attribute='name'),
     'table_description': fields.String(attribute='description'),  # Optional
-}
+})
 
-popular_tables_fields = {
+popular_tables_fields = MappingProxyType({
     'popular_tables': fields.List(fields.Nested(popular_table_fields))
-}
+})
 
 
 class PopularTablesAPI(Resource):
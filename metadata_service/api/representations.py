@@ -0,0 +1,34 @@
+import json
+from typing import Any, Dict, Optional
+
+from flask import Response, current_app, make_response
+from flask_restful.representations.json import output_json as restful_output_json
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, installed with the 'orjson' extra
+    orjson = None  # type: ignore  # the module type does not allow None when orjson is installed
+
+
+def dumps(data: Any) -> bytes:
+    """
+    Encodes data as json, with orjson when it is installed
+    """
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data).encode()
+
+
+def output_json(data: Any, code: int, headers: Optional[Dict[str, str]] = None) -> Response:
+    """
+    Same as the flask_restful json representation, encoding the body with orjson when it is installed.
+    Falls back to flask_restful in debug mode or when RESTFUL_JSON is configured, as orjson does not take
+    the json.dumps arguments (indent, cls, ...).
+    """
+    if orjson is None or current_app.debug or current_app.config.get('RESTFUL_JSON'):
+        return restful_output_json(data, code, headers)
+
+    # always end the json with a new line, as flask_restful does
+    resp = make_response(dumps(data) + b'\n', code)
+    resp.headers.extend(headers or {})
+    return resp
@@ -7,6 +7,7 @@ from flask import request
 from flask_restful import Resource, fields, reqparse, marshal
 from flasgger import swag_from
 
+from metadata_service import cache
 from metadata_service.exception import NotFoundException
 from metadata_service.proxy import get_proxy_client
 
@@ -122,6 +123,7 @@ class TableOwnerAPI(Resource):
     def put(self, table_uri: str, owner: str) -> Iterable[Union[Mapping, int, None]]:
         try:
             self.client.add_owner(table_uri=table_uri, owner=owner)
+            cache.invalidate(namespace=cache.USER_OWN, key=owner)
             return {'message': 'The owner {} for table_uri {} '
                                'is added successfully'.format(owner,
                                                               table_uri)}, HTTPStatus.OK
@@ -134,6 +136,7 @@ class TableOwnerAPI(Resource):
     def delete(self, table_uri: str, owner: str) -> Iterable[Union[Mapping, int, None]]:
         try:
             self.client.delete_owner(table_uri=table_uri, owner=owner)
+            cache.invalidate(namespace=cache.USER_OWN, key=owner)
             return {'message': 'The owner {} for table_uri {} '
                                'is deleted successfully'.format(owner,
                                                                 table_uri)}, HTTPStatus.OK
@@ -1,19 +1,23 @@
+import hashlib
 import logging
 from http import HTTPStatus
-from typing import Iterable, Mapping, Optional, Union
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Tuple, Union
 
-from flask_restful import Resource, fields, marshal
+from flask import Response, request
+from flask_restful import Resource, abort, fields, marshal, reqparse
 from flasgger import swag_from
 from amundsen_common.models.user import UserSchema
+from metadata_service import cache
 from metadata_service.api import BaseAPI
 from metadata_service.api.popular_tables import popular_table_fields
-from metadata_service.entity.popular_table import PopularTableSchema
-from metadata_service.exception import NotFoundException
-from metadata_service.proxy import get_proxy_client
+from metadata_service.api.representations import dumps
+from metadata_service.proxy import BaseProxy, get_proxy_client
+from metadata_service.proxy.write_coalescer import get_write_coalescer
 from metadata_service.util import UserResourceRel
 
 
-user_detail_fields = {
+user_detail_fields = MappingProxyType({
     'email': fields.String,
     'first_name': fields.String,  # Optional
     'last_name': fields.String,  # Optional
@@ -24,15 +28,91 @@ user_detail_fields = {
     'team_name': fields.String,  # Optional
     'employee_type': fields.String,  # Optional
     'manager_fullname': fields.String,  # Optional
-}
+})
 
-table_list_fields = {
+table_list_fields = MappingProxyType({
     'table': fields.List(fields.Nested(popular_table_fields))
-}
+})
+
+# The own endpoint has always returned the PopularTable attribute names (name / description)
+# rather than the table_name / table_description of popular_table_fields
+owned_table_fields = MappingProxyType({
+    'database': fields.String,
+    'cluster': fields.String,
+    'schema': fields.String,
+    'name': fields.String,
+    'description': fields.String,  # Optional
+})
+
+user_resources_fields = MappingProxyType({
+    'follow': fields.List(fields.Nested(popular_table_fields)),
+    'own': fields.List(fields.Nested(owned_table_fields)),
+    'read': fields.List(fields.Nested(popular_table_fields)),
+})
 
 
 LOGGER = logging.getLogger(__name__)
 
+# Each batch request is written in a single transaction: bound its size
+_MAX_BATCH_TABLE_URIS = 1000
+
+
+def _parse_table_uris(parser: reqparse.RequestParser) -> List[str]:
+    """
+    Parses the table_uris of a batch request, aborting with 400 when there are more than _MAX_BATCH_TABLE_URIS.
+    """
+    table_uris = parser.parse_args()['table_uris']
+    if len(table_uris) > _MAX_BATCH_TABLE_URIS:
+        abort(HTTPStatus.BAD_REQUEST,
+              message=f'At most {_MAX_BATCH_TABLE_URIS} table_uris can be passed, got {len(table_uris)}')
+    return table_uris
+
+
+def _stream_table_list(tables: List[Any], table_fields: Mapping[str, Any]) -> Iterator[bytes]:
+    yield b'{"table": ['
+    for i, table in enumerate(tables):
+        if i:
+            yield b', '
+        yield dumps(marshal(table, table_fields))
+    yield b']}'
+
+
+def _get_table_list(*,
+                    namespace: str,
+                    user_id: str,
+                    get_resources: Callable[[], Optional[Dict[str, List[Any]]]]
+                    ) -> Tuple[Optional[Dict[str, List[Any]]], Optional[str]]:
+    """
+    Returns the cached resources of the user along with their ETag, (None, None) if the user does not exist.
+    The ETag hashes the repr of the tables rather than their json, so that it is computed without encoding the list,
+    and only the resources are cached: the json is streamed on every 200, never held in memory.
+    """
+    def createfunc() -> Optional[Tuple[Dict[str, List[Any]], str]]:
+        resources = get_resources()
+        if resources is None:
+            # not cached
+            return None
+        etag = hashlib.blake2b(digest_size=16)
+        for table in resources['table']:
+            etag.update(repr(table).encode())
+        return resources, etag.hexdigest()
+
+    cached = cache.cached_call(namespace=namespace, key=user_id, createfunc=createfunc)
+    if cached is None:
+        return None, None
+    return cached
+
+
+def _table_list_response(resources: Dict[str, List[Any]], table_fields: Mapping[str, Any], etag: str) -> Response:
+    # Response.make_conditional is not used as it would buffer the streamed body to compute its length
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=HTTPStatus.NOT_MODIFIED)
+    else:
+        response = Response(_stream_table_list(resources['table'], table_fields),
+                            status=HTTPStatus.OK, mimetype='application/json')
+    response.set_etag(etag)
+    return response
+
 
 class UserDetailAPI(BaseAPI):
     """
@@ -48,192 +128,350 @@ class UserDetailAPI(BaseAPI):
         return super().get(id=id)
 
 
-class UserFollowsAPI(Resource):
+class _TableListRelation(NamedTuple):
+    namespace: str
+    get_resources: Callable[[BaseProxy, str], Optional[Dict[str, List[Any]]]]
+    table_fields: Mapping[str, Any]
+
+
+# Per relation path variable of UserRelationsAPI: the cache namespace, the proxy call and the fields of the tables
+_TABLE_LIST_RELATIONS = MappingProxyType({
+    'follow': _TableListRelation(
+        namespace=cache.USER_FOLLOW,
+        get_resources=lambda client, user_id: client.get_table_by_user_relation(
+            user_email=user_id, relation_type=UserResourceRel.follow),
+        table_fields=popular_table_fields),
+    'own': _TableListRelation(
+        namespace=cache.USER_OWN,
+        get_resources=lambda client, user_id: client.get_table_by_user_relation(
+            user_email=user_id, relation_type=UserResourceRel.own),
+        table_fields=owned_table_fields),
+    'read': _TableListRelation(
+        namespace=cache.USER_READ,
+        get_resources=lambda client, user_id: client.get_frequently_used_tables(user_email=user_id),
+        table_fields=popular_table_fields),
+})
+
+
+def _add_follow(client: BaseProxy, *, user_id: str, table_uri: str) -> HTTPStatus:
+    write_coalescer = get_write_coalescer()
+    if write_coalescer is not None:
+        write_coalescer.add_table_relation_by_user(
+            table_uri=table_uri,
+            user_email=user_id,
+            relation_type=UserResourceRel.follow,
+            on_done=lambda: cache.invalidate(namespace=cache.USER_FOLLOW, key=user_id))
+        return HTTPStatus.ACCEPTED
+
+    client.add_table_relation_by_user(table_uri=table_uri,
+                                      user_email=user_id,
+                                      relation_type=UserResourceRel.follow)
+    cache.invalidate(namespace=cache.USER_FOLLOW, key=user_id)
+    return HTTPStatus.OK
+
+
+def _delete_follow(client: BaseProxy, *, user_id: str, table_uri: str) -> HTTPStatus:
+    write_coalescer = get_write_coalescer()
+    if write_coalescer is not None:
+        write_coalescer.delete_table_relation_by_user(
+            table_uri=table_uri,
+            user_email=user_id,
+            relation_type=UserResourceRel.follow,
+            on_done=lambda: cache.invalidate(namespace=cache.USER_FOLLOW, key=user_id))
+        return HTTPStatus.ACCEPTED
+
+    client.delete_table_relation_by_user(table_uri=table_uri,
+                                         user_email=user_id,
+                                         relation_type=UserResourceRel.follow)
+    cache.invalidate(namespace=cache.USER_FOLLOW, key=user_id)
+    return HTTPStatus.OK
+
+
+def _add_own(client: BaseProxy, *, user_id: str, table_uri: str) -> HTTPStatus:
+    client.add_owner(table_uri=table_uri, owner=user_id)
+    cache.invalidate(namespace=cache.USER_OWN, key=user_id)
+    return HTTPStatus.OK
+
+
+def _delete_own(client: BaseProxy, *, user_id: str, table_uri: str) -> HTTPStatus:
+    client.delete_owner(table_uri=table_uri, owner=user_id)
+    cache.invalidate(namespace=cache.USER_OWN, key=user_id)
+    return HTTPStatus.OK
+
+
+class _RelationWrites(NamedTuple):
+    subject: str
+    add: Callable[..., HTTPStatus]
+    delete: Callable[..., HTTPStatus]
+
+
+# Per relation path variable of UserRelationAPI: how the user is called in the messages and the write functions
+_RELATION_WRITES = MappingProxyType({
+    'follow': _RelationWrites(subject='The user', add=_add_follow, delete=_delete_follow),
+    'own': _RelationWrites(subject='The owner', add=_add_own, delete=_delete_own),
+})
+
+
+class UserRelationsAPI(Resource):
     """
-    Build get API to support user follow resource features.
+    Build get API returning the resources a user follows, owns or reads, given by the relation path variable.
+    Subclasses can set the relation instead.
     """
+    relation = ''
 
     def __init__(self) -> None:
         self.client = get_proxy_client()
 
-    @swag_from('swagger_doc/user/follow_get.yml')
-    def get(self, user_id: str) -> Iterable[Union[Mapping, int, None]]:
+    @swag_from('swagger_doc/user/relations_get.yml')
+    def get(self, user_id: str, relation: str = '') -> Union[Response, Iterable[Union[Mapping, int, None]]]:
         """
-        Return a list of resources that user has followed
+        Return a list of resources that user has followed, owned or read
 
         :param user_id:
+        :param relation: follow, own or read
         :return:
         """
+        table_list_relation = _TABLE_LIST_RELATIONS[relation or self.relation]
         try:
-            resources = self.client.get_table_by_user_relation(user_email=user_id,
-                                                               relation_type=UserResourceRel.follow)
-            return marshal(resources, table_list_fields), HTTPStatus.OK
-
-        except NotFoundException:
-            return {'message': 'user_id {} does not exist'.format(user_id)}, HTTPStatus.NOT_FOUND
+            resources, etag = _get_table_list(namespace=table_list_relation.namespace, user_id=user_id,
+                                              get_resources=lambda: table_list_relation.get_resources(self.client,
+                                                                                                      user_id))
+            if resources is None or etag is None:
+                return {'message': f'user_id {user_id} does not exist'}, HTTPStatus.NOT_FOUND
+            return _table_list_response(resources, table_list_relation.table_fields, etag)
 
         except Exception:
-            LOGGER.exception('UserFollowAPI GET Failed')
+            LOGGER.exception('UserRelationsAPI GET Failed', extra={'user_id': user_id})
             return {'message': 'Internal server error!'}, HTTPStatus.INTERNAL_SERVER_ERROR
 
 
-class UserFollowAPI(Resource):
+class UserRelationAPI(Resource):
     """
-    Build put / delete API to support user follow resource features.
-    It will create a relationship(follow / followed_by) between user and resources(table, dashboard etc
+    Build put / delete API creating / deleting the relationship between a user and a resource, the relation being
+    given by the relation path variable (follow or own). Subclasses can set the relation instead.
     """
+    relation = ''
 
     def __init__(self) -> None:
         self.client = get_proxy_client()
 
-    @swag_from('swagger_doc/user/follow_put.yml')
-    def put(self, user_id: str, resource_type: str, table_uri: str) -> Iterable[Union[Mapping, int, None]]:
+    @swag_from('swagger_doc/user/relation_put.yml')
+    def put(self, user_id: str, resource_type: str, table_uri: str,
+            relation: str = '') -> Iterable[Union[Mapping, int, None]]:
         """
-        Create the follow relationship between user and resources.
+        Create the relationship between user and resources.
         todo: It will need to refactor all neo4j proxy api to take a type argument.
 
         :param user_id:
+        :param resource_type:
         :param table_uri:
+        :param relation: follow or own
         :return:
         """
+        relation_writes = _RELATION_WRITES[relation or self.relation]
         try:
-            self.client.add_table_relation_by_user(table_uri=table_uri,
-                                                   user_email=user_id,
-                                                   relation_type=UserResourceRel.follow)
-            return {'message': 'The user {} for table_uri {} '
-                               'is added successfully'.format(user_id,
-                                                              table_uri)}, HTTPStatus.OK
-        except Exception as e:
-            LOGGER.exception('UserFollowAPI PUT Failed')
-            return {'message': 'The user {} for table_uri {} '
-                               'is not added successfully'.format(user_id,
-                                                                  table_uri)}, \
-                HTTPStatus.INTERNAL_SERVER_ERROR
-
-    @swag_from('swagger_doc/user/follow_delete.yml')
-    def delete(self, user_id: str, resource_type: str, table_uri: str) -> Iterable[Union[Mapping, int, None]]:
+            status = relation_writes.add(self.client, user_id=user_id, table_uri=table_uri)
+            if status == HTTPStatus.ACCEPTED:
+                return {'message': f'{relation_writes.subject} {user_id} for table_uri {table_uri} '
+                                   'is queued to be added'}, status
+            return {'message': f'{relation_writes.subject} {user_id} for table_uri {table_uri} '
+                               'is added successfully'}, status
+        except Exception:
+            LOGGER.exception('UserRelationAPI PUT Failed', extra={'user_id': user_id})
+            return {'message': f'{relation_writes.subject} {user_id} for table_uri {table_uri} '
+                               'is not added successfully'}, HTTPStatus.INTERNAL_SERVER_ERROR
+
+    @swag_from('swagger_doc/user/relation_delete.yml')
+    def delete(self, user_id: str, resource_type: str, table_uri: str,
+               relation: str = '') -> Iterable[Union[Mapping, int, None]]:
         """
-        Delete the follow relationship between user and resources.
+        Delete the relationship between user and resources.
         todo: It will need to refactor all neo4j proxy api to take a type argument.
 
         :param user_id:
+        :param resource_type:
         :param table_uri:
+        :param relation: follow or own
         :return:
         """
+        relation_writes = _RELATION_WRITES[relation or self.relation]
         try:
-            self.client.delete_table_relation_by_user(table_uri=table_uri,
-                                                      user_email=user_id,
-                                                      relation_type=UserResourceRel.follow)
-            return {'message': 'The user following {} for table_uri {} '
-                               'is deleted successfully'.format(user_id,
-                                                                table_uri)}, HTTPStatus.OK
-        except Exception as e:
-            LOGGER.exception('UserFollowAPI DELETE Failed')
-            return {'message': 'The user {} for table_uri {} '
-                               'is not deleted successfully'.format(user_id,
-                                                                    table_uri)}, \
-                HTTPStatus.INTERNAL_SERVER_ERROR
-
-
-class UserOwnsAPI(Resource):
+            status = relation_writes.delete(self.client, user_id=user_id, table_uri=table_uri)
+            if status == HTTPStatus.ACCEPTED:
+                return {'message': f'{relation_writes.subject} {user_id} for table_uri {table_uri} '
+                                   'is queued to be deleted'}, status
+            return {'message': f'{relation_writes.subject} {user_id} for table_uri {table_uri} '
+                               'is deleted successfully'}, status
+        except Exception:
+            LOGGER.exception('UserRelationAPI DELETE Failed', extra={'user_id': user_id})
+            return {'message': f'{relation_writes.subject} {user_id} for table_uri {table_uri} '
+                               'is not deleted successfully'}, HTTPStatus.INTERNAL_SERVER_ERROR
+
+
+# The per relation resources below are kept for backward compatibility, their routes are served by
+# UserRelationsAPI / UserRelationAPI
+
+class UserFollowsAPI(UserRelationsAPI):
+    """
+    Build get API to support user follow resource features.
+    """
+    relation = 'follow'
+
+
+class UserFollowAPI(UserRelationAPI):
+    """
+    Build put / delete API to support user follow resource features.
+    It will create a relationship(follow / followed_by) between user and resources(table, dashboard etc
+    """
+    relation = 'follow'
+
+
+class UserOwnsAPI(UserRelationsAPI):
     """
     Build get API to support user own resource features.
     """
+    relation = 'own'
+
+
+class UserOwnAPI(UserRelationAPI):
+    """
+    Build put / delete API to support user own resource features.
+    It will create a relationship(owner / owner_of) between user and resources(table, dashboard etc)
+    todo: Deprecate TableOwner API
+    """
+    relation = 'own'
+
+
+class UserReadsAPI(UserRelationsAPI):
+    """
+    Build get API to support user read resource features.
+    """
+    relation = 'read'
+
+
+class UserFollowBatchAPI(Resource):
+    """
+    Build put / delete API to support following / unfollowing several resources with a single request.
+    The resources are passed as a json body, e.g. {"table_uris": ["hive://gold.schema/table1", ...]}
+    """
 
     def __init__(self) -> None:
         self.client = get_proxy_client()
+        self.parser = reqparse.RequestParser()
+        self.parser.add_argument('table_uris', type=str, action='append', required=True, location='json')
 
-    @swag_from('swagger_doc/user/own_get.yml')
-    def get(self, user_id: str) -> Iterable[Union[Mapping, int, None]]:
+    @swag_from('swagger_doc/user/follow_batch_put.yml')
+    def put(self, user_id: str, resource_type: str) -> Iterable[Union[Mapping, int, None]]:
         """
-        Return a list of resources that user has owned
+        Create the follow relationships between user and resources in one transaction.
 
         :param user_id:
+        :param resource_type:
         :return:
         """
+        table_uris = _parse_table_uris(self.parser)
         try:
-            resources = self.client.get_table_by_user_relation(user_email=user_id,
-                                                               relation_type=UserResourceRel.own)
-            if len(resources['table']) > 0:
-                return {'table': PopularTableSchema(many=True).dump(resources['table']).data}, HTTPStatus.OK
-            return {'table': []}, HTTPStatus.OK
+            self.client.add_table_relations_by_user(table_uris=table_uris,
+                                                    user_email=user_id,
+                                                    relation_type=UserResourceRel.follow)
+            cache.invalidate(namespace=cache.USER_FOLLOW, key=user_id)
+            return {'message': f'The user {user_id} for {len(table_uris)} table_uris '
+                               'is added successfully'}, HTTPStatus.OK
+        except Exception:
+            LOGGER.exception('UserFollowBatchAPI PUT Failed', extra={'user_id': user_id})
+            return {'message': f'The user {user_id} for {len(table_uris)} table_uris '
+                               'is not added successfully'}, HTTPStatus.INTERNAL_SERVER_ERROR
 
-        except NotFoundException:
-            return {'message': 'user_id {} does not exist'.format(user_id)}, HTTPStatus.NOT_FOUND
+    @swag_from('swagger_doc/user/follow_batch_delete.yml')
+    def delete(self, user_id: str, resource_type: str) -> Iterable[Union[Mapping, int, None]]:
+        """
+        Delete the follow relationships between user and resources in one transaction.
 
+        :param user_id:
+        :param resource_type:
+        :return:
+        """
+        table_uris = _parse_table_uris(self.parser)
+        try:
+            self.client.delete_table_relations_by_user(table_uris=table_uris,
+                                                       user_email=user_id,
+                                                       relation_type=UserResourceRel.follow)
+            cache.invalidate(namespace=cache.USER_FOLLOW, key=user_id)
+            return {'message': f'The user following {user_id} for {len(table_uris)} table_uris '
+                               'is deleted successfully'}, HTTPStatus.OK
         except Exception:
-            LOGGER.exception('UserOwnAPI GET Failed')
-            return {'message': 'Internal server error!'}, HTTPStatus.INTERNAL_SERVER_ERROR
+            LOGGER.exception('UserFollowBatchAPI DELETE Failed', extra={'user_id': user_id})
+            return {'message': f'The user {user_id} for {len(table_uris)} table_uris '
+                               'is not deleted successfully'}, HTTPStatus.INTERNAL_SERVER_ERROR
 
 
-class UserOwnAPI(Resource):
+class UserOwnBatchAPI(Resource):
     """
-    Build put / delete API to support user own resource features.
-    It will create a relationship(owner / owner_of) between user and resources(table, dashboard etc)
-    todo: Deprecate TableOwner API
+    Build put / delete API to support adding / removing ownership of several resources with a single request.
+    The resources are passed as a json body, e.g. {"table_uris": ["hive://gold.schema/table1", ...]}
     """
 
     def __init__(self) -> None:
         self.client = get_proxy_client()
+        self.parser = reqparse.RequestParser()
+        self.parser.add_argument('table_uris', type=str, action='append', required=True, location='json')
 
-    @swag_from('swagger_doc/user/own_put.yml')
-    def put(self, user_id: str, resource_type: str, table_uri: str) -> Iterable[Union[Mapping, int, None]]:
+    @swag_from('swagger_doc/user/own_batch_put.yml')
+    def put(self, user_id: str, resource_type: str) -> Iterable[Union[Mapping, int, None]]:
         """
-        Create the follow relationship between user and resources.
+        Create the own relationships between user and resources in one transaction.
 
         :param user_id:
         :param resource_type:
-        :param table_uri:
         :return:
         """
+        table_uris = _parse_table_uris(self.parser)
         try:
-            self.client.add_owner(table_uri=table_uri, owner=user_id)
-            return {'message': 'The owner {} for table_uri {} '
-                               'is added successfully'.format(user_id,
-                                                              table_uri)}, HTTPStatus.OK
-        except Exception as e:
-            LOGGER.exception('UserOwnAPI PUT Failed')
-            return {'message': 'The owner {} for table_uri {} '
-                               'is not added successfully'.format(user_id,
-                                                                  table_uri)}, HTTPStatus.INTERNAL_SERVER_ERROR
-
-    @swag_from('swagger_doc/user/own_delete.yml')
-    def delete(self, user_id: str, resource_type: str, table_uri: str) -> Iterable[Union[Mapping, int, None]]:
+            self.client.add_owners(table_uris=table_uris, owner=user_id)
+            cache.invalidate(namespace=cache.USER_OWN, key=user_id)
+            return {'message': f'The owner {user_id} for {len(table_uris)} table_uris '
+                               'is added successfully'}, HTTPStatus.OK
+        except Exception:
+            LOGGER.exception('UserOwnBatchAPI PUT Failed', extra={'user_id': user_id})
+            return {'message': f'The owner {user_id} for {len(table_uris)} table_uris '
+                               'is not added successfully'}, HTTPStatus.INTERNAL_SERVER_ERROR
+
+    @swag_from('swagger_doc/user/own_batch_delete.yml')
+    def delete(self, user_id: str, resource_type: str) -> Iterable[Union[Mapping, int, None]]:
+        table_uris = _parse_table_uris(self.parser)
         try:
-            self.client.delete_owner(table_uri=table_uri, owner=user_id)
-            return {'message': 'The owner {} for table_uri {} '
-                               'is deleted successfully'.format(user_id,
-                                                                table_uri)}, HTTPStatus.OK
+            self.client.delete_owners(table_uris=table_uris, owner=user_id)
+            cache.invalidate(namespace=cache.USER_OWN, key=user_id)
+            return {'message': f'The owner {user_id} for {len(table_uris)} table_uris '
+                               'is deleted successfully'}, HTTPStatus.OK
         except Exception:
-            LOGGER.exception('UserOwnAPI DELETE Failed')
-            return {'message': 'The owner {} for table_uri {} '
-                               'is not deleted successfully'.format(user_id,
-                                                                    table_uri)}, HTTPStatus.INTERNAL_SERVER_ERROR
+            LOGGER.exception('UserOwnBatchAPI DELETE Failed', extra={'user_id': user_id})
+            return {'message': f'The owner {user_id} for {len(table_uris)} table_uris '
+                               'is not deleted successfully'}, HTTPStatus.INTERNAL_SERVER_ERROR
 
 
-class UserReadsAPI(Resource):
+class UserResourcesAPI(Resource):
     """
-    Build get API to support user read resource features.
+    Build get API returning the resources a user follows, owns and reads with a single request.
     """
 
     def __init__(self) -> None:
         self.client = get_proxy_client()
 
-    @swag_from('swagger_doc/user/read_get.yml')
+    @swag_from('swagger_doc/user/resources_get.yml')
     def get(self, user_id: str) -> Iterable[Union[Mapping, int, None]]:
         """
-        Return a list of resources that user has read
+        Return the lists of resources that user has followed, owned and read
 
         :param user_id:
         :return:
         """
         try:
-            resources = self.client.get_frequently_used_tables(user_email=user_id)
-            return marshal(resources, table_list_fields), HTTPStatus.OK
-
-        except NotFoundException:
-            return {'message': 'user_id {} does not exist'.format(user_id)}, HTTPStatus.NOT_FOUND
+            resources = self.client.get_user_resources(user_email=user_id)
+            if resources is None:
+                return {'message': f'user_id {user_id} does not exist'}, HTTPStatus.NOT_FOUND
+            return marshal(resources, user_resources_fields), HTTPStatus.OK
 
         except Exception:
-            LOGGER.exception('UserReadsAPI GET Failed')
+            LOGGER.exception('UserResourcesAPI GET Failed', extra={'user_id': user_id})
             return {'message': 'Internal server error!'}, HTTPStatus.INTERNAL_SERVER_ERROR
@@ -0,0 +1,80 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Tuple  # noqa: F401
+
+# Short expiry as the cache is per process: a write only invalidates the entry of the worker that served it,
+# the other workers pick up the change once their entry expires.
+_USER_RESOURCE_CACHE_EXPIRY_SEC = 30
+# The keys come from the request path: bound the number of entries, the least recently used ones are evicted
+_USER_RESOURCE_CACHE_MAXSIZE = 10_000
+
+# Namespaces of the user resource lookups, one per relation between the user and the resources
+USER_FOLLOW = 'user_follow'
+USER_OWN = 'user_own'
+USER_READ = 'user_read'
+
+# (namespace, key) -> (expiry time, value), in least recently used order
+_CACHE = OrderedDict()  # type: OrderedDict[Tuple[str, str], Tuple[float, Any]]
+_CACHE_LOCK = threading.RLock()
+# Incremented by every invalidation, so that a value created concurrently with an invalidation is not cached
+_invalidation_count = 0
+
+
+def cached_call(*, namespace: str, key: str, createfunc: Callable[[], Any]) -> Any:
+    """
+    Returns the cached value for the key within the namespace, calling createfunc on a miss or when the value has
+    expired. Exceptions raised by createfunc are propagated and nothing is cached, nor are None values (e.g. an
+    unknown user), so that arbitrary keys do not take up the cache.
+
+    :param namespace: one of the namespaces defined above
+    :param key: e.g. the user id
+    :param createfunc: function returning the value to cache
+    :return:
+    """
+    cache_key = (namespace, key)
+    with _CACHE_LOCK:
+        entry = _CACHE.get(cache_key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > time.monotonic():
+                _CACHE.move_to_end(cache_key)
+                return value
+            del _CACHE[cache_key]
+        invalidation_count = _invalidation_count
+
+    # called without the lock, so that a slow lookup does not block the other keys
+    value = createfunc()
+    if value is None:
+        return value
+
+    with _CACHE_LOCK:
+        if invalidation_count == _invalidation_count:
+            _CACHE[cache_key] = (time.monotonic() + _USER_RESOURCE_CACHE_EXPIRY_SEC, value)
+            _CACHE.move_to_end(cache_key)
+            while len(_CACHE) > _USER_RESOURCE_CACHE_MAXSIZE:
+                _CACHE.popitem(last=False)
+    return value
+
+
+def invalidate(*, namespace: str, key: str) -> None:
+    """
+    Removes the cached value for the key within the namespace, if any.
+
+    :param namespace: one of the namespaces defined above
+    :param key: e.g. the user id
+    :return:
+    """
+    global _invalidation_count
+
+    with _CACHE_LOCK:
+        _invalidation_count += 1
+        _CACHE.pop((namespace, key), None)
+
+
+def clear() -> None:
+    """
+    Removes all the cached values
+    """
+    with _CACHE_LOCK:
+        _CACHE.clear()
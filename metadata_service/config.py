@@ -1,5 +1,5 @@
 import os
-from typing import List
+from typing import Any, Dict, List
 
 # PROXY configuration keys
 PROXY_HOST = 'PROXY_HOST'
@@ -7,6 +7,7 @@ PROXY_PORT = 'PROXY_PORT'
 PROXY_USER = 'PROXY_USER'
 PROXY_PASSWORD = 'PROXY_PASSWORD'
 PROXY_CLIENT = 'PROXY_CLIENT'
+PROXY_CLIENT_KWARGS = 'PROXY_CLIENT_KWARGS'
 
 PROXY_CLIENTS = {
     'NEO4J': 'metadata_service.proxy.neo4j_proxy.Neo4jProxy',
@@ -15,6 +16,10 @@ PROXY_CLIENTS = {
 
 IS_STATSD_ON = 'IS_STATSD_ON'
 
+# User relation write coalescing configuration keys
+USER_RELATION_WRITE_COALESCING = 'USER_RELATION_WRITE_COALESCING'
+USER_RELATION_WRITE_FLUSH_INTERVAL_SEC = 'USER_RELATION_WRITE_FLUSH_INTERVAL_SEC'
+
 
 class Config:
     LOG_FORMAT = '%(asctime)s.%(msecs)03d [%(levelname)s] %(module)s.%(funcName)s:%(lineno)d (%(process)d:' \
@@ -32,6 +37,22 @@ class Config:
 
     IS_STATSD_ON = False
 
+    # Neo4j driver connection pool, shared by all the requests served by a process.
+    # The pool size bounds the number of concurrent queries per process: keep it at least as large as the number of
+    # threads serving requests (e.g. gunicorn workers * threads), 50-200 is a sensible range. Requests waiting longer
+    # than the acquisition timeout (in seconds) for a free connection fail instead of queueing forever; keep it below
+    # the timeout of the surrounding load balancer, 5-60 seconds.
+    # Both are parsed when the config is imported: a malformed environment variable fails the startup with a
+    # ValueError rather than the first request.
+    NEO4J_MAX_CONNECTION_POOL_SIZE = int(os.environ.get('NEO4J_MAX_CONNECTION_POOL_SIZE', 50))
+    NEO4J_CONNECTION_ACQUISITION_TIMEOUT = float(os.environ.get('NEO4J_CONNECTION_ACQUISITION_TIMEOUT', 60.0))
+
+    # When enabled, the follow / unfollow requests are queued and return 202 Accepted, and a background thread writes
+    # the queued requests of the process in batches every flush interval (in seconds), one transaction per user
+    # instead of one per request. Queued writes are lost if the process is killed before the next flush.
+    USER_RELATION_WRITE_COALESCING = os.environ.get('USER_RELATION_WRITE_COALESCING', 'false').lower() == 'true'
+    USER_RELATION_WRITE_FLUSH_INTERVAL_SEC = float(os.environ.get('USER_RELATION_WRITE_FLUSH_INTERVAL_SEC', 0.02))
+
     # Used to differentiate tables with other entities in Atlas. For more details:
     # https://github.com/lyft/amundsenmetadatalibrary/blob/master/docs/proxy/atlas_proxy.md
     ATLAS_TABLE_ENTITY = 'Table'
@@ -54,6 +75,12 @@ class LocalConfig(Config):
     PROXY_HOST = os.environ.get('PROXY_HOST', f'bolt://{LOCAL_HOST}')
     PROXY_PORT = os.environ.get('PROXY_PORT', 7687)
     PROXY_CLIENT = PROXY_CLIENTS[os.environ.get('PROXY_CLIENT', 'NEO4J')]
+    # Keyword arguments passed to the proxy client on top of host, port, user and password.
+    # A config overriding the NEO4J_* settings above overrides PROXY_CLIENT_KWARGS as well.
+    PROXY_CLIENT_KWARGS: Dict[str, Any] = {
+        'num_conns': Config.NEO4J_MAX_CONNECTION_POOL_SIZE,
+        'connection_acquisition_timeout_sec': Config.NEO4J_CONNECTION_ACQUISITION_TIMEOUT,
+    } if PROXY_CLIENT == PROXY_CLIENTS['NEO4J'] else {}
 
     JANUS_GRAPH_URL = None
 
@@ -12,16 +12,18 @@ _proxy_client_lock = Lock()
 
 def get_proxy_client() -> BaseProxy:
     """
-    Provides singleton proxy client based on the config
+    Provides singleton proxy client based on the config.
+    The client (and the connection pool it holds) is created once per process, so the API resources can call this
+    on every request: after the first call it is a plain module attribute lookup.
     :return: Proxy instance of any subclass of BaseProxy
     """
     global _proxy_client
 
-    if _proxy_client:
+    if _proxy_client is not None:
         return _proxy_client
 
     with _proxy_client_lock:
-        if _proxy_client:
+        if _proxy_client is not None:
             return _proxy_client
         else:
             # Gather all the configuration to create a Proxy Client
@@ -29,8 +31,10 @@ def get_proxy_client() -> BaseProxy:
             port = current_app.config[config.PROXY_PORT]
             user = current_app.config[config.PROXY_USER]
             password = current_app.config[config.PROXY_PASSWORD]
+            # backend specific arguments, e.g. the connection pool settings of the neo4j proxy
+            client_kwargs = current_app.config.get(config.PROXY_CLIENT_KWARGS, {})
 
             client = import_string(current_app.config[config.PROXY_CLIENT])
-            _proxy_client = client(host=host, port=port, user=user, password=password)
+            _proxy_client = client(host=host, port=port, user=user, password=password, **client_kwargs)
 
     return _proxy_client
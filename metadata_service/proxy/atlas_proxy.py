@@ -1,7 +1,7 @@
 import logging
 import re
 from random import randint
-from typing import Any, Dict, List, Tuple, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 from amundsen_common.models.table import Column, Statistics, Table, Tag, User
 from amundsen_common.models.user import User as UserEntity
@@ -288,6 +288,9 @@ class AtlasProxy(BaseProxy):
     def get_users(self) -> List[UserEntity]:
         pass
 
+    def get_users_batch(self, *, ids: List[str]) -> Dict[str, UserEntity]:
+        pass
+
     def get_table(self, *, table_uri: str) -> Table:
         """
         Gathers all the information needed for the Table Detail Page.
@@ -352,6 +355,19 @@ class AtlasProxy(BaseProxy):
         entity.entity[self.ATTRS_KEY]['owner'] = owner
         entity.update()
 
+    def delete_owners(self, *, table_uris: List[str], owner: str) -> None:
+        pass
+
+    def add_owners(self, *, table_uris: List[str], owner: str) -> None:
+        """
+        Atlas has no bulk update for the owner attribute, so this replaces the owner of each table in turn.
+        :param table_uris:
+        :param owner: Email address of the owner
+        :return: None
+        """
+        for table_uri in table_uris:
+            self.add_owner(table_uri=table_uri, owner=owner)
+
     def get_table_description(self, *,
                               table_uri: str) -> Union[str, None]:
         """
@@ -521,7 +537,8 @@ class AtlasProxy(BaseProxy):
                 )
         return tags
 
-    def get_table_by_user_relation(self, *, user_email: str, relation_type: UserResourceRel) -> Dict[str, Any]:
+    def get_table_by_user_relation(self, *, user_email: str,
+                                   relation_type: UserResourceRel) -> Optional[Dict[str, Any]]:
         params = {
             'typeName': self.READER_TYPE,
             'offset': '0',
@@ -558,8 +575,13 @@ class AtlasProxy(BaseProxy):
 
         return {'table': results}
 
-    def get_frequently_used_tables(self, *, user_email: str) -> Dict[str, Any]:
-        pass
+    def get_frequently_used_tables(self, *, user_email: str) -> Optional[Dict[str, Any]]:
+        # Not supported yet: None would mean that the user does not exist
+        return {'table': []}
+
+    def get_user_resources(self, *, user_email: str) -> Optional[Dict[str, List[PopularTable]]]:
+        # Not supported yet: None would mean that the user does not exist
+        return {'follow': [], 'own': [], 'read': []}
 
     def add_table_relation_by_user(self, *,
                                    table_uri: str,
@@ -577,3 +599,21 @@ class AtlasProxy(BaseProxy):
         entity = self._get_reader_entity(table_uri=table_uri, user_id=user_email)
         entity.entity[self.ATTRS_KEY][self.BKMARKS_KEY] = False
         entity.update()
+
+    def add_table_relations_by_user(self, *,
+                                    table_uris: List[str],
+                                    user_email: str,
+                                    relation_type: UserResourceRel) -> None:
+        for table_uri in table_uris:
+            self.add_table_relation_by_user(table_uri=table_uri,
+                                            user_email=user_email,
+                                            relation_type=relation_type)
+
+    def delete_table_relations_by_user(self, *,
+                                       table_uris: List[str],
+                                       user_email: str,
+                                       relation_type: UserResourceRel) -> None:
+        for table_uri in table_uris:
+            self.delete_table_relation_by_user(table_uri=table_uri,
+                                               user_email=user_email,
+                                               relation_type=relation_type)
@@ -1,5 +1,5 @@
 from abc import ABCMeta, abstractmethod
-from typing import Any, Dict, List, Union
+from typing import Any, Dict, List, Optional, Union
 
 from amundsen_common.models.table import Table
 from amundsen_common.models.user import User as UserEntity
@@ -21,6 +21,10 @@ class BaseProxy(metaclass=ABCMeta):
     def get_users(self) -> List[UserEntity]:
         pass
 
+    @abstractmethod
+    def get_users_batch(self, *, ids: List[str]) -> Dict[str, UserEntity]:
+        pass
+
     @abstractmethod
     def get_table(self, *, table_uri: str) -> Table:
         pass
@@ -33,6 +37,14 @@ class BaseProxy(metaclass=ABCMeta):
     def add_owner(self, *, table_uri: str, owner: str) -> None:
         pass
 
+    @abstractmethod
+    def delete_owners(self, *, table_uris: List[str], owner: str) -> None:
+        pass
+
+    @abstractmethod
+    def add_owners(self, *, table_uris: List[str], owner: str) -> None:
+        pass
+
     @abstractmethod
     def get_table_description(self, *,
                               table_uri: str) -> Union[str, None]:
@@ -79,11 +91,24 @@ class BaseProxy(metaclass=ABCMeta):
 
     @abstractmethod
     def get_table_by_user_relation(self, *, user_email: str,
-                                   relation_type: UserResourceRel) -> Dict[str, Any]:
+                                   relation_type: UserResourceRel) -> Optional[Dict[str, Any]]:
+        """
+        :return: the resources as {'table': [...]}, or None if the user does not exist
+        """
         pass
 
     @abstractmethod
-    def get_frequently_used_tables(self, *, user_email: str) -> Dict[str, Any]:
+    def get_frequently_used_tables(self, *, user_email: str) -> Optional[Dict[str, Any]]:
+        """
+        :return: the resources as {'table': [...]}, or None if the user does not exist
+        """
+        pass
+
+    @abstractmethod
+    def get_user_resources(self, *, user_email: str) -> Optional[Dict[str, List[PopularTable]]]:
+        """
+        :return: the resources keyed by relation (follow, own and read), or None if the user does not exist
+        """
         pass
 
     @abstractmethod
@@ -99,3 +124,17 @@ class BaseProxy(metaclass=ABCMeta):
                                       user_email: str,
                                       relation_type: UserResourceRel) -> None:
         pass
+
+    @abstractmethod
+    def add_table_relations_by_user(self, *,
+                                    table_uris: List[str],
+                                    user_email: str,
+                                    relation_type: UserResourceRel) -> None:
+        pass
+
+    @abstractmethod
+    def delete_table_relations_by_user(self, *,
+                                       table_uris: List[str],
+                                       user_email: str,
+                                       relation_type: UserResourceRel) -> None:
+        pass
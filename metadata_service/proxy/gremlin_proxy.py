@@ -91,6 +91,9 @@ class AbstractGremlinProxy(BaseProxy):
     def get_users(self) -> List[UserEntity]:
         pass
 
+    def get_users_batch(self, *, ids: List[str]) -> Dict[str, UserEntity]:
+        pass
+
     def get_table(self, *, table_uri: str) -> Table:
         pass
 
@@ -100,6 +103,12 @@ class AbstractGremlinProxy(BaseProxy):
     def add_owner(self, *, table_uri: str, owner: str) -> None:
         pass
 
+    def delete_owners(self, *, table_uris: List[str], owner: str) -> None:
+        pass
+
+    def add_owners(self, *, table_uris: List[str], owner: str) -> None:
+        pass
+
     def get_table_description(self, *,
                               table_uri: str) -> Union[str, None]:
         pass
@@ -136,11 +145,17 @@ class AbstractGremlinProxy(BaseProxy):
         pass
 
     def get_table_by_user_relation(self, *, user_email: str,
-                                   relation_type: UserResourceRel) -> Dict[str, Any]:
-        pass
+                                   relation_type: UserResourceRel) -> Optional[Dict[str, Any]]:
+        # Not supported yet: None would mean that the user does not exist
+        return {'table': []}
 
-    def get_frequently_used_tables(self, *, user_email: str) -> Dict[str, Any]:
-        pass
+    def get_frequently_used_tables(self, *, user_email: str) -> Optional[Dict[str, Any]]:
+        # Not supported yet: None would mean that the user does not exist
+        return {'table': []}
+
+    def get_user_resources(self, *, user_email: str) -> Optional[Dict[str, List[PopularTable]]]:
+        # Not supported yet: None would mean that the user does not exist
+        return {'follow': [], 'own': [], 'read': []}
 
     def add_table_relation_by_user(self, *,
                                    table_uri: str,
@@ -154,6 +169,18 @@ class AbstractGremlinProxy(BaseProxy):
                                       relation_type: UserResourceRel) -> None:
         pass
 
+    def add_table_relations_by_user(self, *,
+                                    table_uris: List[str],
+                                    user_email: str,
+                                    relation_type: UserResourceRel) -> None:
+        pass
+
+    def delete_table_relations_by_user(self, *,
+                                       table_uris: List[str],
+                                       user_email: str,
+                                       relation_type: UserResourceRel) -> None:
+        pass
+
 
 class GenericGremlinProxy(AbstractGremlinProxy):
     """
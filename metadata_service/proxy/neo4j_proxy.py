@@ -27,6 +27,13 @@ _GET_POPULAR_TABLE_CACHE_EXPIRY_SEC = 11 * 60 * 60 + randint(0, 3600)
 
 LOGGER = logging.getLogger(__name__)
 
+# Relationship pattern between the user and the table per relation type, see _get_user_table_relationship_clause
+_USER_TABLE_RELATIONSHIPS = {
+    UserResourceRel.follow: '(usr{user_matcher})-[rel:FOLLOW]->(tbl{tbl_matcher})',
+    UserResourceRel.own: '(usr{user_matcher})<-[rel:OWNER]-(tbl{tbl_matcher})',
+    UserResourceRel.read: '(usr{user_matcher})-[rel:READ]->(tbl{tbl_matcher})',
+}
+
 
 class Neo4jProxy(BaseProxy):
     """
@@ -39,7 +46,8 @@ class Neo4jProxy(BaseProxy):
                  user: str = 'neo4j',
                  password: str = '',
                  num_conns: int = 50,
-                 max_connection_lifetime_sec: int = 100) -> None:
+                 max_connection_lifetime_sec: int = 100,
+                 connection_acquisition_timeout_sec: float = 60.0) -> None:
         """
         There's currently no request timeout from client side where server
         side can be enforced via "dbms.transaction.timeout"
@@ -49,12 +57,34 @@ class Neo4jProxy(BaseProxy):
         :param max_connection_lifetime_sec: max life time the connection can have when it comes to reuse. In other
         words, connection life time longer than this value won't be reused and closed on garbage collection. This
         value needs to be smaller than surrounding network environment's timeout.
+        :param connection_acquisition_timeout_sec: max time to wait for a connection from the pool when all the
+        num_conns connections are in use.
         """
         endpoint = f'{host}:{port}'
         self._driver = GraphDatabase.driver(endpoint, max_connection_pool_size=num_conns,
                                             connection_timeout=10,
+                                            connection_acquisition_timeout=connection_acquisition_timeout_sec,
                                             max_connection_lifetime=max_connection_lifetime_sec,
                                             auth=(user, password))  # type: Driver
+        self.ensure_indexes()
+
+    def ensure_indexes(self) -> None:
+        """
+        Creates the uniqueness constraints (and thereby the indexes) on the keys the user and table lookups start
+        from, so that those lookups don't scan all the nodes of the label. Creating an existing constraint is a
+        no-op. A failure (e.g. missing schema privilege, or duplicated keys) is logged but doesn't prevent the
+        service from starting, as the queries still work without the indexes.
+        """
+        constraint_queries = [
+            'CREATE CONSTRAINT ON (usr:User) ASSERT usr.key IS UNIQUE',
+            'CREATE CONSTRAINT ON (tbl:Table) ASSERT tbl.key IS UNIQUE',
+        ]
+        for query in constraint_queries:
+            try:
+                with self._driver.session() as session:
+                    session.run(query).consume()
+            except Exception:
+                LOGGER.exception('Failed to execute {query}'.format(query=query))
 
     @timer_with_counter
     def get_table(self, *, table_uri: str) -> Table:
@@ -532,6 +562,36 @@ class Neo4jProxy(BaseProxy):
             tx.commit()
             tx.close()
 
+    @timer_with_counter
+    def add_owners(self, *,
+                   table_uris: List[str],
+                   owner: str) -> None:
+        """
+        Batch version of add_owner. All the owner relations are upserted in a single transaction.
+
+        :param table_uris:
+        :param owner:
+        :return:
+        """
+        self.add_table_relations_by_user(table_uris=table_uris,
+                                         user_email=owner,
+                                         relation_type=UserResourceRel.own)
+
+    @timer_with_counter
+    def delete_owners(self, *,
+                      table_uris: List[str],
+                      owner: str) -> None:
+        """
+        Batch version of delete_owner. All the owner relations are deleted in a single transaction.
+
+        :param table_uris:
+        :param owner:
+        :return:
+        """
+        self.delete_table_relations_by_user(table_uris=table_uris,
+                                            user_email=owner,
+                                            relation_type=UserResourceRel.own)
+
     @timer_with_counter
     def add_tag(self, *,
                 table_uri: str,
@@ -721,14 +781,20 @@ class Neo4jProxy(BaseProxy):
 
         popular_tables = []
         for record in records:
-            popular_table = PopularTable(database=record['database_name'],
-                                         cluster=record['cluster_name'],
-                                         schema=record['schema_name'],
-                                         name=record['table_name'],
-                                         description=self._safe_get(record, 'table_description'))
-            popular_tables.append(popular_table)
+            popular_tables.append(self._build_popular_table_from_record(record))
         return popular_tables
 
+    def _build_popular_table_from_record(self, record: dict) -> PopularTable:
+        """
+        Builds a PopularTable from a record projecting database_name, cluster_name, schema_name, table_name
+        and table_description
+        """
+        return PopularTable(database=record['database_name'],
+                            cluster=record['cluster_name'],
+                            schema=record['schema_name'],
+                            name=record['table_name'],
+                            description=self._safe_get(record, 'table_description'))
+
     @timer_with_counter
     def get_user(self, *, id: str) -> Union[UserEntity, None]:
         """
@@ -771,6 +837,33 @@ class Neo4jProxy(BaseProxy):
 
         return [self._build_user_from_record(record=rec) for rec in result['users']]
 
+    @timer_with_counter
+    def get_users_batch(self, *, ids: List[str]) -> Dict[str, UserEntity]:
+        """
+        Retrieve the details of several users with a single query.
+
+        :param ids: the emails of the users
+        :return: the users keyed by email. Users not found in the graph are left out.
+        """
+
+        query = textwrap.dedent("""
+        UNWIND $user_ids AS user_id
+        MATCH (user:User {key: user_id})
+        OPTIONAL MATCH (user)-[:MANAGE_BY]->(manager:User)
+        RETURN user_id, user as user_record, manager as manager_record
+        """)
+
+        records = self._execute_cypher_query(statement=query,
+                                             param_dict={'user_ids': ids})
+
+        users = {}  # type: Dict[str, UserEntity]
+        for record in records:
+            manager_record = record.get('manager_record')
+            manager_name = manager_record.get('full_name', '') if manager_record else ''
+            users[record['user_id']] = self._build_user_from_record(record=record['user_record'],
+                                                                    manager_name=manager_name)
+        return users
+
     @staticmethod
     def _build_user_from_record(record: dict, manager_name: str = '') -> UserEntity:
         return UserEntity(email=record['email'],
@@ -790,7 +883,11 @@ class Neo4jProxy(BaseProxy):
         """
         Returns the relationship clause of a cypher query between users and tables
         The User node is 'usr', the table node is 'tbl', and the relationship is 'rel'
-        e.g. (usr:User)-[rel:READ]->(tbl:Table), (usr)-[rel:READ]->(tbl)
+        e.g. (usr:User)-[rel:READ]->(tbl:Table), (usr)-[rel:READ]->(tbl),
+        (usr:User {key: $user_email})-[rel:READ]->(tbl:Table {key: $tbl_key})
+
+        tbl_key and user_key are Cypher expressions (a $parameter or a variable), never the key values themselves,
+        so that the query text stays the same across calls and Neo4j can reuse its cached query plan.
         """
         tbl_matcher: str = ''
         user_matcher: str = ''
@@ -798,90 +895,139 @@ class Neo4jProxy(BaseProxy):
         if tbl_key is not None:
             tbl_matcher += ':Table'
             if tbl_key != '':
-                tbl_matcher += f' {{key: "{tbl_key}"}}'
+                tbl_matcher += f' {{key: {tbl_key}}}'
 
         if user_key is not None:
             user_matcher += ':User'
             if user_key != '':
-                user_matcher += f' {{key: "{user_key}"}}'
-
-        if relation_type == UserResourceRel.follow:
-            relation = f'(usr{user_matcher})-[rel:FOLLOW]->(tbl{tbl_matcher})'
-        elif relation_type == UserResourceRel.own:
-            relation = f'(usr{user_matcher})<-[rel:OWNER]-(tbl{tbl_matcher})'
-        elif relation_type == UserResourceRel.read:
-            relation = f'(usr{user_matcher})-[rel:READ]->(tbl{tbl_matcher})'
-        else:
+                user_matcher += f' {{key: {user_key}}}'
+
+        try:
+            relation = _USER_TABLE_RELATIONSHIPS[relation_type]
+        except KeyError:
             raise NotImplementedError(f'The relation type {relation_type} is not defined!')
-        return relation
+        return relation.format(user_matcher=user_matcher, tbl_matcher=tbl_matcher)
 
     @timer_with_counter
-    def get_table_by_user_relation(self, *, user_email: str, relation_type: UserResourceRel) -> Dict[str, Any]:
+    def get_table_by_user_relation(self, *, user_email: str,
+                                   relation_type: UserResourceRel) -> Optional[Dict[str, Any]]:
         """
         Retrive all follow the resources per user based on the relation.
         We start with table resources only, then add dashboard.
 
         :param user_email: the email of the user
         :param relation_type: the relation between the user and the resource
-        :return:
+        :return: None if the user does not exist
         """
-        rel_clause: str = self._get_user_table_relationship_clause(relation_type=relation_type,
-                                                                   tbl_key='',
-                                                                   user_key=user_email)
+        rel_clause: str = self._get_user_table_relationship_clause(relation_type=relation_type)
+        # The user is matched on its own so that a user without resources (one row without table)
+        # can be told apart from a user who does not exist (no row)
         query = textwrap.dedent(f"""
-        MATCH {rel_clause}<-[:TABLE]-(schema:Schema)<-[:SCHEMA]-(clstr:Cluster)<-[:CLUSTER]-(db:Database)
+        MATCH (usr:User {{key: $query_key}})
+        OPTIONAL MATCH {rel_clause}<-[:TABLE]-(schema:Schema)<-[:SCHEMA]-(clstr:Cluster)<-[:CLUSTER]-(db:Database)
         WITH db, clstr, schema, tbl
         OPTIONAL MATCH (tbl)-[:DESCRIPTION]->(tbl_dscrpt:Description)
-        RETURN db, clstr, schema, tbl, tbl_dscrpt""")
+        RETURN db.name as database_name, clstr.name as cluster_name, schema.name as schema_name,
+        tbl.name as table_name, tbl_dscrpt.description as table_description""")
 
         table_records = self._execute_cypher_query(statement=query, param_dict={'query_key': user_email})
 
-        if not table_records:
-            raise NotFoundException('User {user_id} does not {relation} any resources'.format(user_id=user_email,
-                                                                                              relation=relation_type))
-        results = []
-        for record in table_records:
-            results.append(PopularTable(
-                database=record['db']['name'],
-                cluster=record['clstr']['name'],
-                schema=record['schema']['name'],
-                name=record['tbl']['name'],
-                description=self._safe_get(record, 'tbl_dscrpt', 'description')))
-        return {'table': results}
+        return self._build_table_list_from_records(table_records)
 
     @timer_with_counter
-    def get_frequently_used_tables(self, *, user_email: str) -> Dict[str, Any]:
+    def get_frequently_used_tables(self, *, user_email: str) -> Optional[Dict[str, Any]]:
         """
         Retrieves all Table the resources per user on READ relation.
 
         :param user_email: the email of the user
-        :return:
+        :return: None if the user does not exist
         """
 
         query = textwrap.dedent("""
-        MATCH (user:User {key: $query_key})-[r:READ]->(tbl:Table)
+        MATCH (user:User {key: $query_key})
+        OPTIONAL MATCH (user)-[r:READ]->(tbl:Table)
         WHERE EXISTS(r.published_tag) AND r.published_tag IS NOT NULL
         WITH user, r, tbl ORDER BY r.published_tag DESC, r.read_count DESC LIMIT 50
-        MATCH (tbl:Table)<-[:TABLE]-(schema:Schema)<-[:SCHEMA]-(clstr:Cluster)<-[:CLUSTER]-(db:Database)
+        OPTIONAL MATCH (tbl)<-[:TABLE]-(schema:Schema)<-[:SCHEMA]-(clstr:Cluster)<-[:CLUSTER]-(db:Database)
         OPTIONAL MATCH (tbl)-[:DESCRIPTION]->(tbl_dscrpt:Description)
-        RETURN db, clstr, schema, tbl, tbl_dscrpt
+        RETURN db.name as database_name, clstr.name as cluster_name, schema.name as schema_name,
+        tbl.name as table_name, tbl_dscrpt.description as table_description
         """)
 
         table_records = self._execute_cypher_query(statement=query, param_dict={'query_key': user_email})
 
-        if not table_records:
-            raise NotFoundException('User {user_id} does not READ any resources'.format(user_id=user_email))
-        results = []
+        return self._build_table_list_from_records(table_records)
 
+    def _build_table_list_from_records(self, table_records: BoltStatementResult) -> Optional[Dict[str, Any]]:
+        """
+        Builds the table list of the user resource queries, which return no record when the user does not exist,
+        and a record without table when the user exists but has no resource.
+        """
+        user_found = False
+        results = []
         for record in table_records:
-            results.append(PopularTable(
-                database=record['db']['name'],
-                cluster=record['clstr']['name'],
-                schema=record['schema']['name'],
-                name=record['tbl']['name'],
-                description=self._safe_get(record, 'tbl_dscrpt', 'description')))
+            user_found = True
+            if record['database_name'] is None:
+                continue
+            results.append(self._build_popular_table_from_record(record))
+
+        if not user_found:
+            return None
         return {'table': results}
 
+    @timer_with_counter
+    def get_user_resources(self, *, user_email: str) -> Optional[Dict[str, List[PopularTable]]]:
+        """
+        Retrieves the tables the user follows, owns and frequently reads with a single query, one UNION branch
+        per relation, so a profile page does not need one round trip per relation.
+        The read branch follows the same rules as get_frequently_used_tables.
+
+        :param user_email: the email of the user
+        :return: the tables keyed by relation: follow, own and read, None if the user does not exist
+        """
+
+        # The first branch matches the user on its own, returning one row without table, so that a user without
+        # resources can be told apart from a user who does not exist (no row)
+        query = textwrap.dedent("""
+        MATCH (usr:User {key: $query_key})
+        RETURN 'user' as relation, null as database_name, null as cluster_name, null as schema_name,
+        null as table_name, null as table_description
+        UNION ALL
+        MATCH (usr:User {key: $query_key})-[:FOLLOW]->(tbl:Table)
+        MATCH (tbl)<-[:TABLE]-(schema:Schema)<-[:SCHEMA]-(clstr:Cluster)<-[:CLUSTER]-(db:Database)
+        OPTIONAL MATCH (tbl)-[:DESCRIPTION]->(tbl_dscrpt:Description)
+        RETURN 'follow' as relation, db.name as database_name, clstr.name as cluster_name, schema.name as schema_name,
+        tbl.name as table_name, tbl_dscrpt.description as table_description
+        UNION ALL
+        MATCH (usr:User {key: $query_key})<-[:OWNER]-(tbl:Table)
+        MATCH (tbl)<-[:TABLE]-(schema:Schema)<-[:SCHEMA]-(clstr:Cluster)<-[:CLUSTER]-(db:Database)
+        OPTIONAL MATCH (tbl)-[:DESCRIPTION]->(tbl_dscrpt:Description)
+        RETURN 'own' as relation, db.name as database_name, clstr.name as cluster_name, schema.name as schema_name,
+        tbl.name as table_name, tbl_dscrpt.description as table_description
+        UNION ALL
+        MATCH (usr:User {key: $query_key})-[r:READ]->(tbl:Table)
+        WHERE EXISTS(r.published_tag) AND r.published_tag IS NOT NULL
+        WITH r, tbl ORDER BY r.published_tag DESC, r.read_count DESC LIMIT 50
+        MATCH (tbl)<-[:TABLE]-(schema:Schema)<-[:SCHEMA]-(clstr:Cluster)<-[:CLUSTER]-(db:Database)
+        OPTIONAL MATCH (tbl)-[:DESCRIPTION]->(tbl_dscrpt:Description)
+        RETURN 'read' as relation, db.name as database_name, clstr.name as cluster_name, schema.name as schema_name,
+        tbl.name as table_name, tbl_dscrpt.description as table_description
+        """)
+
+        table_records = self._execute_cypher_query(statement=query, param_dict={'query_key': user_email})
+
+        user_found = False
+        results = {'follow': [], 'own': [], 'read': []}  # type: Dict[str, List[PopularTable]]
+        for record in table_records:
+            if record['relation'] == 'user':
+                user_found = True
+                continue
+            results[record['relation']].append(self._build_popular_table_from_record(record))
+
+        if not user_found:
+            return None
+        return results
+
     @timer_with_counter
     def add_table_relation_by_user(self, *,
                                    table_uri: str,
@@ -903,12 +1049,9 @@ class Neo4jProxy(BaseProxy):
         on CREATE SET u={email: $user_email, key: $user_email}
         """)
 
-        user_email_clause = f'key: "{user_email}"'
-        tbl_key = f'key: "{table_uri}"'
-
         rel_clause: str = self._get_user_table_relationship_clause(relation_type=relation_type)
         upsert_user_relation_query = textwrap.dedent(f"""
-        MATCH (usr:User {{{user_email_clause}}}), (tbl:Table {{{tbl_key}}})
+        MATCH (usr:User {{key: $user_email}}), (tbl:Table {{key: $tbl_key}})
         MERGE {rel_clause}
         RETURN usr.key, tbl.key
         """)
@@ -917,7 +1060,8 @@ class Neo4jProxy(BaseProxy):
             tx = self._driver.session().begin_transaction()
             # upsert the node
             tx.run(upsert_user_query, {'user_email': user_email})
-            result = tx.run(upsert_user_relation_query, {})
+            result = tx.run(upsert_user_relation_query, {'user_email': user_email,
+                                                         'tbl_key': table_uri})
 
             if not result.single():
                 raise RuntimeError('Failed to create relation between '
@@ -946,17 +1090,103 @@ class Neo4jProxy(BaseProxy):
         :return:
         """
         rel_clause: str = self._get_user_table_relationship_clause(relation_type=relation_type,
-                                                                   user_key=user_email,
-                                                                   tbl_key=table_uri)
+                                                                   user_key='$user_email',
+                                                                   tbl_key='$tbl_key')
+
+        delete_query = textwrap.dedent(f"""
+        MATCH {rel_clause}
+        DELETE rel
+        """)
+
+        try:
+            tx = self._driver.session().begin_transaction()
+            tx.run(delete_query, {'user_email': user_email,
+                                  'tbl_key': table_uri})
+            tx.commit()
+        except Exception as e:
+            # propagate the exception back to api
+            if not tx.closed():
+                tx.rollback()
+            raise e
+        finally:
+            tx.close()
+
+    @timer_with_counter
+    def add_table_relations_by_user(self, *,
+                                    table_uris: List[str],
+                                    user_email: str,
+                                    relation_type: UserResourceRel) -> None:
+        """
+        Batch version of add_table_relation_by_user. The user node is upserted once and all the relations are
+        upserted with a single UNWIND query, so the whole batch is committed (or rolled back) in one transaction.
+
+        :param table_uris:
+        :param user_email:
+        :param relation_type:
+        :return:
+        """
+
+        upsert_user_query = textwrap.dedent("""
+        MERGE (u:User {key: $user_email})
+        on CREATE SET u={email: $user_email, key: $user_email}
+        """)
+
+        rel_clause: str = self._get_user_table_relationship_clause(relation_type=relation_type)
+        upsert_user_relations_query = textwrap.dedent(f"""
+        UNWIND $tbl_keys AS tbl_key
+        MATCH (usr:User {{key: $user_email}}), (tbl:Table {{key: tbl_key}})
+        MERGE {rel_clause}
+        RETURN tbl.key AS tbl_key
+        """)
+
+        try:
+            tx = self._driver.session().begin_transaction()
+            # upsert the node
+            tx.run(upsert_user_query, {'user_email': user_email})
+            result = tx.run(upsert_user_relations_query, {'user_email': user_email,
+                                                          'tbl_keys': table_uris})
+
+            missing_tbl_keys = set(table_uris) - {record['tbl_key'] for record in result}
+            if missing_tbl_keys:
+                raise RuntimeError('Failed to create relation between '
+                                   'user {user} and tables {tbls}'.format(user=user_email,
+                                                                          tbls=sorted(missing_tbl_keys)))
+            tx.commit()
+        except Exception as e:
+            if not tx.closed():
+                tx.rollback()
+            # propagate the exception back to api
+            raise e
+        finally:
+            tx.close()
+
+    @timer_with_counter
+    def delete_table_relations_by_user(self, *,
+                                       table_uris: List[str],
+                                       user_email: str,
+                                       relation_type: UserResourceRel) -> None:
+        """
+        Batch version of delete_table_relation_by_user. All the relations are deleted with a single UNWIND query.
+
+        :param table_uris:
+        :param user_email:
+        :param relation_type:
+        :return:
+        """
+        rel_clause: str = self._get_user_table_relationship_clause(relation_type=relation_type,
+                                                                   user_key='$user_email',
+                                                                   tbl_key='tbl_key')
 
         delete_query = textwrap.dedent(f"""
+        UNWIND $tbl_keys AS tbl_key
         MATCH {rel_clause}
         DELETE rel
         """)
 
         try:
             tx = self._driver.session().begin_transaction()
-            tx.run(delete_query, {})
+            tx.run(delete_query, {'user_email': user_email,
+                                  'tbl_keys': table_uris})
             tx.commit()
         except Exception as e:
             # propagate the exception back to api
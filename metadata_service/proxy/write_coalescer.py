@@ -0,0 +1,172 @@
+import atexit
+import logging
+import queue
+import threading
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple  # noqa: F401
+
+from flask import Flask, current_app
+
+from metadata_service import config
+from metadata_service.proxy import get_proxy_client
+from metadata_service.proxy.base_proxy import BaseProxy
+from metadata_service.util import UserResourceRel
+
+LOGGER = logging.getLogger(__name__)
+
+
+class _RelationWrite(NamedTuple):
+    user_email: str
+    table_uri: str
+    relation_type: UserResourceRel
+    is_add: bool
+    on_done: Optional[Callable[[], None]]
+
+
+class WriteCoalescer:
+    """
+    Coalesces the user / table relation writes of many requests into batched writes.
+    The writes are queued, and a background thread flushes the queue every flush_interval_sec: for each user and
+    relation type, the tables to add and the tables to delete are written with one add_table_relations_by_user and
+    one delete_table_relations_by_user call, i.e. one transaction instead of one per request.
+    The writes are flushed within an app context of the given app, as the proxies read its config (e.g. statsd).
+    """
+
+    def __init__(self, *,
+                 app: Flask,
+                 client: BaseProxy,
+                 flush_interval_sec: float = 0.02,
+                 max_batch_size: int = 1000) -> None:
+        self._app = app
+        self._client = client
+        self._flush_interval_sec = flush_interval_sec
+        self._max_batch_size = max_batch_size
+        self._queue = queue.Queue()  # type: queue.Queue
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='WriteCoalescer', daemon=True)
+        self._thread.start()
+        # flush what is still queued when the process exits
+        atexit.register(self.stop)
+
+    def add_table_relation_by_user(self, *,
+                                   table_uri: str,
+                                   user_email: str,
+                                   relation_type: UserResourceRel,
+                                   on_done: Optional[Callable[[], None]] = None) -> None:
+        """
+        Queues the creation of the relation between the user and the table.
+
+        :param on_done: called from the background thread once the write has been flushed
+        """
+        self._queue.put(_RelationWrite(user_email, table_uri, relation_type, True, on_done))
+
+    def delete_table_relation_by_user(self, *,
+                                      table_uri: str,
+                                      user_email: str,
+                                      relation_type: UserResourceRel,
+                                      on_done: Optional[Callable[[], None]] = None) -> None:
+        """
+        Queues the deletion of the relation between the user and the table.
+
+        :param on_done: called from the background thread once the write has been flushed
+        """
+        self._queue.put(_RelationWrite(user_email, table_uri, relation_type, False, on_done))
+
+    def stop(self) -> None:
+        """
+        Stops the background thread, flushing the queued writes first.
+        """
+        self._stopped.set()
+        self._thread.join()
+
+    def flush(self) -> None:
+        """
+        Writes all the queued writes.
+        Only the last write of a given user, table and relation type is kept: adding and deleting a relation are
+        idempotent, so the outcome is the same as writing them one after the other.
+        """
+        # the background thread has no app context of its own
+        with self._app.app_context():
+            self._flush()
+
+    def _flush(self) -> None:
+        writes = self._drain()
+        latest_writes = {}  # type: Dict[Tuple[str, str, UserResourceRel], _RelationWrite]
+        for write in writes:
+            latest_writes[(write.user_email, write.table_uri, write.relation_type)] = write
+
+        batches = {}  # type: Dict[Tuple[str, UserResourceRel, bool], List[str]]
+        for write in latest_writes.values():
+            batches.setdefault((write.user_email, write.relation_type, write.is_add), []).append(write.table_uri)
+
+        for (user_email, relation_type, is_add), table_uris in batches.items():
+            for i in range(0, len(table_uris), self._max_batch_size):
+                self._write(user_email=user_email,
+                            relation_type=relation_type,
+                            is_add=is_add,
+                            table_uris=table_uris[i:i + self._max_batch_size])
+
+        for write in writes:
+            if write.on_done is not None:
+                try:
+                    write.on_done()
+                except Exception:
+                    LOGGER.exception('WriteCoalescer on_done callback failed')
+
+    def _drain(self) -> List[_RelationWrite]:
+        writes = []  # type: List[_RelationWrite]
+        while True:
+            try:
+                writes.append(self._queue.get_nowait())
+            except queue.Empty:
+                return writes
+
+    def _write(self, *, user_email: str, relation_type: UserResourceRel, is_add: bool, table_uris: List[str]) -> None:
+        batch_write = self._client.add_table_relations_by_user if is_add \
+            else self._client.delete_table_relations_by_user
+        try:
+            batch_write(table_uris=table_uris, user_email=user_email, relation_type=relation_type)
+            return
+        except Exception:
+            LOGGER.exception('WriteCoalescer batch write failed for user %s and table_uris %s', user_email, table_uris)
+            if len(table_uris) == 1:
+                return
+
+        # The batch is a single transaction: one unknown table fails all of it, so retry the tables one by one
+        write = self._client.add_table_relation_by_user if is_add else self._client.delete_table_relation_by_user
+        for table_uri in table_uris:
+            try:
+                write(table_uri=table_uri, user_email=user_email, relation_type=relation_type)
+            except Exception:
+                LOGGER.exception('WriteCoalescer write failed for user %s and table_uri %s', user_email, table_uri)
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self._flush_interval_sec):
+            self.flush()
+        self.flush()
+
+
+_write_coalescer = None
+_write_coalescer_lock = threading.Lock()
+
+
+def get_write_coalescer() -> Optional[WriteCoalescer]:
+    """
+    Provides the singleton write coalescer, or None when the writes are not coalesced (see
+    USER_RELATION_WRITE_COALESCING in config.py).
+    """
+    global _write_coalescer
+
+    if not current_app.config.get(config.USER_RELATION_WRITE_COALESCING):
+        return None
+
+    if _write_coalescer is not None:
+        return _write_coalescer
+
+    with _write_coalescer_lock:
+        if _write_coalescer is None:
+            _write_coalescer = WriteCoalescer(
+                app=current_app._get_current_object(),
+                client=get_proxy_client(),
+                flush_interval_sec=current_app.config[config.USER_RELATION_WRITE_FLUSH_INTERVAL_SEC])
+
+    return _write_coalescer
@@ -22,7 +22,8 @@ setup(
     dependency_links=[],
     install_requires=requirements,
     extras_require={
-        'oidc': ['flaskoidc==0.0.2']
+        'oidc': ['flaskoidc==0.0.2'],
+        'orjson': ['orjson>=3.0']
     },
     python_requires=">=3.6"
 )
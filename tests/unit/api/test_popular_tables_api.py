@@ -2,6 +2,7 @@ from http import HTTPStatus
 
 from mock import patch, Mock
 
+from metadata_service.api.popular_tables import popular_table_fields
 from tests.unit.test_basics import BasicTestCase
 
 API_RESPONSE = [{'database': 'ministry',
@@ -44,3 +45,7 @@ class TestPopularTablesAPI(BasicTestCase):
         self.app.test_client().get('popular_tables/?limit=90')
 
         self.mock_proxy.get_popular_tables.assert_called_with(num_entries=90)
+
+    def test_popular_table_fields_are_read_only(self) -> None:
+        with self.assertRaises(TypeError):
+            popular_table_fields['table_name'] = None  # type: ignore
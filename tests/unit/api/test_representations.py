@@ -0,0 +1,45 @@
+import json
+import unittest
+from http import HTTPStatus
+from unittest import mock
+
+from flask_restful import marshal
+
+from metadata_service.api.popular_tables import popular_tables_fields
+from metadata_service.api.representations import dumps, orjson, output_json
+from metadata_service.entity.popular_table import PopularTable
+from tests.unit.test_basics import BasicTestCase
+
+DATA = {'table': [{'database': 'hive', 'table_name': 'foo_table', 'table_description': None}]}
+
+
+class OutputJsonTest(BasicTestCase):
+
+    @mock.patch('metadata_service.api.representations.orjson', None)
+    def test_output_json_without_orjson(self) -> None:
+        response = output_json(DATA, HTTPStatus.OK)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(json.loads(response.data), DATA)
+        self.assertEqual(dumps(DATA), json.dumps(DATA).encode())
+
+    @mock.patch('metadata_service.api.representations.orjson')
+    def test_output_json_with_orjson(self, mock_orjson: mock.MagicMock) -> None:
+        mock_orjson.dumps.return_value = b'{}'
+        response = output_json(DATA, HTTPStatus.OK, headers={'X-Test': '1'})
+        self.assertEqual(response.data, b'{}\n')
+        self.assertEqual(response.headers['X-Test'], '1')
+        mock_orjson.dumps.assert_called_once_with(DATA)
+
+    @mock.patch('metadata_service.api.representations.orjson')
+    def test_output_json_with_restful_json_settings(self, mock_orjson: mock.MagicMock) -> None:
+        self.app.config['RESTFUL_JSON'] = {'indent': 2}
+        response = output_json(DATA, HTTPStatus.OK)
+        self.assertEqual(json.loads(response.data), DATA)
+        mock_orjson.dumps.assert_not_called()
+
+    @unittest.skipIf(orjson is None, 'orjson is not installed')
+    def test_dumps_marshalled_with_orjson(self) -> None:
+        # marshal returns OrderedDicts, which old orjson versions do not encode
+        table = PopularTable(database='hive', cluster='gold', schema='foo_schema', name='foo_table')
+        data = marshal({'popular_tables': [table]}, popular_tables_fields)
+        self.assertEqual(json.loads(dumps(data)), json.loads(json.dumps(data)))
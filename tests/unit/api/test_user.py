@@ -1,11 +1,18 @@
+import json
 import unittest
 
 from http import HTTPStatus
 from unittest import mock
 from mock import MagicMock
 
-from metadata_service.api.user import (UserDetailAPI, UserFollowAPI, UserFollowsAPI,
-                                       UserOwnsAPI, UserOwnAPI, UserReadsAPI)
+from metadata_service import cache
+from metadata_service.api.user import (LOGGER, UserDetailAPI, UserFollowAPI, UserFollowsAPI,
+                                       UserOwnsAPI, UserOwnAPI, UserReadsAPI, UserResourcesAPI)
+from metadata_service.entity.popular_table import PopularTable
+from metadata_service.util import UserResourceRel
+from tests.unit.test_basics import BasicTestCase
+
+TABLE_URIS = ['hive://gold.test_schema/test_table1', 'hive://gold.test_schema/test_table2']
 
 
 class UserDetailAPITest(unittest.TestCase):
@@ -28,26 +35,93 @@ class UserDetailAPITest(unittest.TestCase):
         self.assertEqual(list(response)[1], HTTPStatus.OK)
         self.mock_client.get_users.assert_called_once()
 
+    def test_schema_is_reused(self) -> None:
+        self.mock_client.get_user.return_value = {}
+        self.api.schema = MagicMock()
+        self.api.get(id='username')
+        self.api.get(id='username')
+        self.api.schema.assert_called_once_with(many=False)
+
 
-class UserFollowsAPITest(unittest.TestCase):
+class UserFollowsAPITest(BasicTestCase):
 
     @mock.patch('metadata_service.api.user.get_proxy_client')
     def setUp(self, mock_get_proxy_client: MagicMock) -> None:
+        super().setUp()
+        self.request_context = self.app.test_request_context()
+        self.request_context.push()
+        cache.clear()
         self.mock_client = mock.Mock()
         mock_get_proxy_client.return_value = self.mock_client
         self.api = UserFollowsAPI()
 
+    def tearDown(self) -> None:
+        self.request_context.pop()
+        super().tearDown()
+
     def test_get(self) -> None:
         self.mock_client.get_table_by_user_relation.return_value = {'table': []}
         response = self.api.get(user_id='username')
-        self.assertEqual(list(response)[1], HTTPStatus.OK)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
         self.mock_client.get_table_by_user_relation.assert_called_once()
 
+    def test_get_streams_tables(self) -> None:
+        tables = [PopularTable(database='hive', cluster='gold', schema='foo_schema', name=name)
+                  for name in ('foo_table', 'bar_table')]
+        self.mock_client.get_table_by_user_relation.return_value = {'table': tables}
+        response = self.api.get(user_id='username')
+        self.assertFalse(response.is_sequence)
+        self.assertEqual(response.mimetype, 'application/json')
+        body = json.loads(b''.join(response.response))
+        self.assertEqual([table['table_name'] for table in body['table']], ['foo_table', 'bar_table'])
+
+    def test_get_invalid_user(self) -> None:
+        self.mock_client.get_table_by_user_relation.return_value = None
+        response = self.api.get(user_id='username')
+        self.assertEqual(list(response)[1], HTTPStatus.NOT_FOUND)
+
+    def test_get_not_modified(self) -> None:
+        table = PopularTable(database='hive', cluster='gold', schema='foo_schema', name='foo_table')
+        self.mock_client.get_table_by_user_relation.return_value = {'table': [table]}
+        with mock.patch('metadata_service.api.user.get_proxy_client', return_value=self.mock_client):
+            response = self.app.test_client().get('/user/username/follow/')
+            etag = response.headers['ETag']
+            self.assertEqual(response.status_code, HTTPStatus.OK)
 
-class UserFollowAPITest(unittest.TestCase):
+            # the json is not encoded again for a 304
+            with mock.patch('metadata_service.api.user.marshal') as mock_marshal:
+                response = self.app.test_client().get('/user/username/follow/', headers={'If-None-Match': etag})
+            mock_marshal.assert_not_called()
+            self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
+            self.assertEqual(response.data, b'')
+            self.assertEqual(self.mock_client.get_table_by_user_relation.call_count, 1)
+
+            # the ETag changes with the followed tables
+            cache.clear()
+            self.mock_client.get_table_by_user_relation.return_value = {'table': []}
+            response = self.app.test_client().get('/user/username/follow/', headers={'If-None-Match': etag})
+            self.assertEqual(response.status_code, HTTPStatus.OK)
+            self.assertNotEqual(response.headers['ETag'], etag)
+
+    def test_get_is_cached_until_follow_changes(self) -> None:
+        self.mock_client.get_table_by_user_relation.return_value = {'table': []}
+        self.api.get(user_id='username')
+        self.api.get(user_id='username')
+        self.assertEqual(self.mock_client.get_table_by_user_relation.call_count, 1)
+
+        with mock.patch('metadata_service.api.user.get_proxy_client') as mock_get_proxy_client:
+            mock_get_proxy_client.return_value = self.mock_client
+            UserFollowAPI().put(user_id='username', resource_type='2', table_uri='3')
+
+        self.api.get(user_id='username')
+        self.assertEqual(self.mock_client.get_table_by_user_relation.call_count, 2)
+
+
+class UserFollowAPITest(BasicTestCase):
 
     @mock.patch('metadata_service.api.user.get_proxy_client')
     def setUp(self, mock_get_proxy_client: MagicMock) -> None:
+        super().setUp()
         self.mock_client = mock.Mock()
         mock_get_proxy_client.return_value = self.mock_client
         self.api = UserFollowAPI()
@@ -62,21 +136,144 @@ class UserFollowAPITest(unittest.TestCase):
         self.assertEqual(list(response)[1], HTTPStatus.OK)
         self.mock_client.delete_table_relation_by_user.assert_called_once()
 
+    @mock.patch('metadata_service.api.user.get_write_coalescer')
+    def test_put_coalesced(self, mock_get_write_coalescer: MagicMock) -> None:
+        response = self.api.put(user_id='username', resource_type='2', table_uri='3')
+        self.assertEqual(list(response)[1], HTTPStatus.ACCEPTED)
+        mock_get_write_coalescer.return_value.add_table_relation_by_user.assert_called_once_with(
+            table_uri='3', user_email='username', relation_type=UserResourceRel.follow, on_done=mock.ANY)
+        self.mock_client.add_table_relation_by_user.assert_not_called()
+
+    @mock.patch('metadata_service.api.user.get_write_coalescer')
+    def test_delete_coalesced(self, mock_get_write_coalescer: MagicMock) -> None:
+        response = self.api.delete(user_id='username', resource_type='2', table_uri='3')
+        self.assertEqual(list(response)[1], HTTPStatus.ACCEPTED)
+        mock_get_write_coalescer.return_value.delete_table_relation_by_user.assert_called_once_with(
+            table_uri='3', user_email='username', relation_type=UserResourceRel.follow, on_done=mock.ANY)
+        self.mock_client.delete_table_relation_by_user.assert_not_called()
+
+
+class UserRelationAPITest(BasicTestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        cache.clear()
+        self.mock_get_proxy_client = mock.patch('metadata_service.api.user.get_proxy_client')
+        self.mock_client = self.mock_get_proxy_client.start().return_value = mock.Mock()
+
+    def tearDown(self) -> None:
+        super().tearDown()
+        self.mock_get_proxy_client.stop()
+
+    def test_get_read(self) -> None:
+        self.mock_client.get_frequently_used_tables.return_value = {'table': []}
+        response = self.app.test_client().get('/user/username/read/')
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(response.json, {'table': []})
+        self.mock_client.get_frequently_used_tables.assert_called_once_with(user_email='username')
+
+    def test_get_own(self) -> None:
+        self.mock_client.get_table_by_user_relation.return_value = {'table': []}
+        response = self.app.test_client().get('/user/username/own/')
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.mock_client.get_table_by_user_relation.assert_called_once_with(user_email='username',
+                                                                            relation_type=UserResourceRel.own)
+
+    def test_put_own(self) -> None:
+        response = self.app.test_client().put('/user/username/own/table/' + TABLE_URIS[0])
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.mock_client.add_owner.assert_called_once_with(table_uri=TABLE_URIS[0], owner='username')
+
+    def test_delete_follow(self) -> None:
+        response = self.app.test_client().delete('/user/username/follow/table/' + TABLE_URIS[0])
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.mock_client.delete_table_relation_by_user.assert_called_once_with(table_uri=TABLE_URIS[0],
+                                                                               user_email='username',
+                                                                               relation_type=UserResourceRel.follow)
+
+    def test_put_read_is_not_routed(self) -> None:
+        self.app.test_client().put('/user/username/read/table/' + TABLE_URIS[0])
+        self.mock_client.add_table_relation_by_user.assert_not_called()
+
+
+class UserFollowBatchAPITest(BasicTestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.mock_get_proxy_client = mock.patch('metadata_service.api.user.get_proxy_client')
+        self.mock_client = self.mock_get_proxy_client.start().return_value = mock.Mock()
+
+    def tearDown(self) -> None:
+        super().tearDown()
+        self.mock_get_proxy_client.stop()
+
+    def test_put(self) -> None:
+        response = self.app.test_client().put('/user/username/follow/table/', json={'table_uris': TABLE_URIS})
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.mock_client.add_table_relations_by_user.assert_called_once_with(table_uris=TABLE_URIS,
+                                                                             user_email='username',
+                                                                             relation_type=UserResourceRel.follow)
 
-class UserOwnsAPITest(unittest.TestCase):
+    def test_put_without_table_uris(self) -> None:
+        response = self.app.test_client().put('/user/username/follow/table/', json={})
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+        self.mock_client.add_table_relations_by_user.assert_not_called()
+
+    def test_put_too_many_table_uris(self) -> None:
+        table_uris = [f'hive://gold.schema/table{i}' for i in range(1001)]
+        response = self.app.test_client().put('/user/username/follow/table/', json={'table_uris': table_uris})
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+        self.mock_client.add_table_relations_by_user.assert_not_called()
+
+    def test_delete(self) -> None:
+        response = self.app.test_client().delete('/user/username/follow/table/', json={'table_uris': TABLE_URIS})
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.mock_client.delete_table_relations_by_user.assert_called_once_with(table_uris=TABLE_URIS,
+                                                                                user_email='username',
+                                                                                relation_type=UserResourceRel.follow)
+
+    def test_delete_failure(self) -> None:
+        self.mock_client.delete_table_relations_by_user.side_effect = RuntimeError()
+        response = self.app.test_client().delete('/user/username/follow/table/', json={'table_uris': TABLE_URIS})
+        self.assertEqual(response.status_code, HTTPStatus.INTERNAL_SERVER_ERROR)
+        # the message reports the number of table_uris rather than the list
+        self.assertNotIn(TABLE_URIS[0], response.get_json()['message'])
+
+
+class UserOwnsAPITest(BasicTestCase):
 
     @mock.patch('metadata_service.api.user.get_proxy_client')
     def setUp(self, mock_get_proxy_client: MagicMock) -> None:
+        super().setUp()
+        self.request_context = self.app.test_request_context()
+        self.request_context.push()
         self.mock_client = mock.Mock()
         mock_get_proxy_client.return_value = self.mock_client
+        cache.clear()
         self.api = UserOwnsAPI()
 
+    def tearDown(self) -> None:
+        self.request_context.pop()
+        super().tearDown()
+
     def test_get(self) -> None:
         self.mock_client.get_table_by_user_relation.return_value = {'table': []}
         response = self.api.get(user_id='username')
-        self.assertEqual(list(response)[1], HTTPStatus.OK)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
         self.mock_client.get_table_by_user_relation.assert_called_once()
 
+    def test_get_serialization(self) -> None:
+        self.mock_client.get_table_by_user_relation.return_value = {
+            'table': [PopularTable(database='hive', cluster='gold', schema='foo_schema', name='foo_table')]
+        }
+        response = self.api.get(user_id='username')
+        body = json.loads(b''.join(response.response))
+        self.assertEqual(body, {'table': [{'database': 'hive',
+                                           'cluster': 'gold',
+                                           'schema': 'foo_schema',
+                                           'name': 'foo_table',
+                                           'description': None}]})
+
 
 class UserOwnAPITest(unittest.TestCase):
 
@@ -97,13 +294,75 @@ class UserOwnAPITest(unittest.TestCase):
         self.mock_client.delete_owner.assert_called_once()
 
 
-class UserReadsAPITest(unittest.TestCase):
+class UserOwnBatchAPITest(BasicTestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.mock_get_proxy_client = mock.patch('metadata_service.api.user.get_proxy_client')
+        self.mock_client = self.mock_get_proxy_client.start().return_value = mock.Mock()
+
+    def tearDown(self) -> None:
+        super().tearDown()
+        self.mock_get_proxy_client.stop()
+
+    def test_put(self) -> None:
+        response = self.app.test_client().put('/user/username/own/table/', json={'table_uris': TABLE_URIS})
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.mock_client.add_owners.assert_called_once_with(table_uris=TABLE_URIS, owner='username')
+
+    def test_delete(self) -> None:
+        response = self.app.test_client().delete('/user/username/own/table/', json={'table_uris': TABLE_URIS})
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.mock_client.delete_owners.assert_called_once_with(table_uris=TABLE_URIS, owner='username')
+
+    def test_delete_too_many_table_uris(self) -> None:
+        table_uris = [f'hive://gold.schema/table{i}' for i in range(1001)]
+        response = self.app.test_client().delete('/user/username/own/table/', json={'table_uris': table_uris})
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+        self.mock_client.delete_owners.assert_not_called()
+
+
+class UserReadsAPITest(BasicTestCase):
     @mock.patch('metadata_service.api.user.get_proxy_client')
     def test_get(self, mock_get_proxy_client: MagicMock) -> None:
+        cache.clear()
         mock_client = mock.Mock()
         mock_get_proxy_client.return_value = mock_client
-        mock_client.get_table_by_user_relation.return_value = {'table': []}
+        mock_client.get_frequently_used_tables.return_value = {'table': []}
         api = UserReadsAPI()
-        response = api.get(user_id='username')
-        self.assertEqual(list(response)[1], HTTPStatus.OK)
+        with self.app.test_request_context():
+            response = api.get(user_id='username')
+        self.assertEqual(response.status_code, HTTPStatus.OK)
         mock_client.get_frequently_used_tables.assert_called_once()
+
+
+class UserResourcesAPITest(unittest.TestCase):
+
+    @mock.patch('metadata_service.api.user.get_proxy_client')
+    def setUp(self, mock_get_proxy_client: MagicMock) -> None:
+        self.mock_client = mock.Mock()
+        mock_get_proxy_client.return_value = self.mock_client
+        self.api = UserResourcesAPI()
+
+    def test_get(self) -> None:
+        table = PopularTable(database='hive', cluster='gold', schema='foo_schema', name='foo_table')
+        self.mock_client.get_user_resources.return_value = {'follow': [table], 'own': [table], 'read': []}
+        response = self.api.get(user_id='username')
+        self.assertEqual(list(response)[1], HTTPStatus.OK)
+        self.assertEqual(list(response)[0]['follow'][0]['table_name'], 'foo_table')
+        # same keys as the own endpoint
+        self.assertEqual(list(response)[0]['own'][0]['name'], 'foo_table')
+        self.assertEqual(list(response)[0]['read'], [])
+        self.mock_client.get_user_resources.assert_called_once_with(user_email='username')
+
+    def test_get_invalid_user(self) -> None:
+        self.mock_client.get_user_resources.return_value = None
+        response = self.api.get(user_id='username')
+        self.assertEqual(list(response)[1], HTTPStatus.NOT_FOUND)
+
+    def test_get_failure(self) -> None:
+        self.mock_client.get_user_resources.side_effect = RuntimeError()
+        with self.assertLogs(LOGGER, level='ERROR') as logs:
+            response = self.api.get(user_id='username')
+        self.assertEqual(list(response)[1], HTTPStatus.INTERNAL_SERVER_ERROR)
+        self.assertEqual(getattr(logs.records[0], 'user_id'), 'username')
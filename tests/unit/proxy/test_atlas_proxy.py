@@ -347,6 +347,15 @@ class TestAtlasProxy(unittest.TestCase, Data):
                                           column_name=attributes['name'],
                                           description='DOESNT_MATTER')
 
+    def test_get_frequently_used_tables(self) -> None:
+        # None would mean that the user does not exist
+        self.assertEqual(self.proxy.get_frequently_used_tables(user_email='test_user_id'), {'table': []})
+
+    def test_get_user_resources(self) -> None:
+        # None would mean that the user does not exist
+        self.assertEqual(self.proxy.get_user_resources(user_email='test_user_id'),
+                         {'follow': [], 'own': [], 'read': []})
+
     def test_get_table_by_user_relation(self) -> None:
         reader1 = copy.deepcopy(self.reader_entity1)
         reader1 = self.to_class(reader1)
@@ -555,23 +555,47 @@ class TestNeo4jProxy(unittest.TestCase):
             users = neo4j_proxy.get_users()
             self.assertEquals(users, UserSchema(many=True).load([test_user]).data)
 
-    def test_get_resources_by_user_relation(self) -> None:
+    def test_get_users_batch(self) -> None:
         with patch.object(GraphDatabase, 'driver'), patch.object(Neo4jProxy, '_execute_cypher_query') as mock_execute:
-
             mock_execute.return_value = [
                 {
-                    'tbl': {
-                        'name': 'table_name'
-                    },
-                    'db': {
-                        'name': 'db_name'
+                    'user_id': 'test_email',
+                    'user_record': {
+                        'email': 'test_email',
+                        'full_name': 'test_full_name',
+                        'is_active': True,
                     },
-                    'clstr': {
-                        'name': 'cluster'
-                    },
-                    'schema': {
-                        'name': 'schema'
+                    'manager_record': {
+                        'full_name': 'test_manager_fullname'
+                    }
+                },
+                {
+                    'user_id': 'other_email',
+                    'user_record': {
+                        'email': 'other_email',
                     },
+                    'manager_record': None
+                }
+            ]
+            neo4j_proxy = Neo4jProxy(host='DOES_NOT_MATTER', port=0000)
+            users = neo4j_proxy.get_users_batch(ids=['test_email', 'other_email', 'unknown_email'])
+
+            self.assertEqual(mock_execute.call_count, 1)
+            self.assertEqual(set(users.keys()), {'test_email', 'other_email'})
+            self.assertEqual(users['test_email'].full_name, 'test_full_name')
+            self.assertEqual(users['test_email'].manager_fullname, 'test_manager_fullname')
+            self.assertEqual(users['other_email'].manager_fullname, '')
+
+    def test_get_resources_by_user_relation(self) -> None:
+        with patch.object(GraphDatabase, 'driver'), patch.object(Neo4jProxy, '_execute_cypher_query') as mock_execute:
+
+            mock_execute.return_value = [
+                {
+                    'table_name': 'table_name',
+                    'database_name': 'db_name',
+                    'cluster_name': 'cluster',
+                    'schema_name': 'schema',
+                    'table_description': None,
                 }
             ]
 
@@ -584,6 +608,53 @@ class TestNeo4jProxy(unittest.TestCase):
             self.assertEqual(result['table'][0].cluster, 'cluster')
             self.assertEqual(result['table'][0].schema, 'schema')
 
+    def test_get_resources_by_user_relation_without_resources(self) -> None:
+        with patch.object(GraphDatabase, 'driver'), patch.object(Neo4jProxy, '_execute_cypher_query') as mock_execute:
+            # the user exists but the optional match did not find any table
+            mock_execute.return_value = [{'database_name': None, 'cluster_name': None, 'schema_name': None,
+                                          'table_name': None, 'table_description': None}]
+
+            neo4j_proxy = Neo4jProxy(host='DOES_NOT_MATTER', port=0000)
+            result = neo4j_proxy.get_table_by_user_relation(user_email='test_user',
+                                                            relation_type=UserResourceRel.follow)
+            self.assertEqual(result, {'table': []})
+
+    def test_get_resources_by_invalid_user(self) -> None:
+        with patch.object(GraphDatabase, 'driver'), patch.object(Neo4jProxy, '_execute_cypher_query') as mock_execute:
+            mock_execute.return_value = []
+
+            neo4j_proxy = Neo4jProxy(host='DOES_NOT_MATTER', port=0000)
+            self.assertIsNone(neo4j_proxy.get_table_by_user_relation(user_email='invalid_user',
+                                                                     relation_type=UserResourceRel.follow))
+            self.assertIsNone(neo4j_proxy.get_frequently_used_tables(user_email='invalid_user'))
+            self.assertIsNone(neo4j_proxy.get_user_resources(user_email='invalid_user'))
+
+    def test_get_user_resources(self) -> None:
+        with patch.object(GraphDatabase, 'driver'), patch.object(Neo4jProxy, '_execute_cypher_query') as mock_execute:
+            table_record = {
+                'table_name': 'table_name',
+                'database_name': 'db_name',
+                'cluster_name': 'cluster',
+                'schema_name': 'schema',
+                'table_description': None,
+            }
+            mock_execute.return_value = [
+                {'relation': 'user', 'table_name': None, 'database_name': None, 'cluster_name': None,
+                 'schema_name': None, 'table_description': None},
+                dict(table_record, relation='follow'),
+                dict(table_record, relation='read'),
+                dict(table_record, relation='read', table_name='other_table_name'),
+            ]
+
+            neo4j_proxy = Neo4jProxy(host='DOES_NOT_MATTER', port=0000)
+            result = neo4j_proxy.get_user_resources(user_email='test_user')
+
+            self.assertEqual(mock_execute.call_count, 1)
+            self.assertEqual(len(result['follow']), 1)
+            self.assertEqual(result['follow'][0].name, 'table_name')
+            self.assertEqual(result['own'], [])
+            self.assertEqual([table.name for table in result['read']], ['table_name', 'other_table_name'])
+
     def test_add_resource_relation_by_user(self) -> None:
         with patch.object(GraphDatabase, 'driver') as mock_driver:
             mock_session = MagicMock()
@@ -624,6 +695,119 @@ class TestNeo4jProxy(unittest.TestCase):
             self.assertEquals(mock_run.call_count, 1)
             self.assertEquals(mock_commit.call_count, 1)
 
+    def test_get_user_table_relationship_clause(self) -> None:
+        self.assertEqual(Neo4jProxy._get_user_table_relationship_clause(relation_type=UserResourceRel.follow),
+                         '(usr)-[rel:FOLLOW]->(tbl)')
+        self.assertEqual(Neo4jProxy._get_user_table_relationship_clause(relation_type=UserResourceRel.own,
+                                                                        user_key='$user_email',
+                                                                        tbl_key='tbl_key'),
+                         '(usr:User {key: $user_email})<-[rel:OWNER]-(tbl:Table {key: tbl_key})')
+        self.assertEqual(Neo4jProxy._get_user_table_relationship_clause(relation_type=UserResourceRel.read,
+                                                                        user_key='',
+                                                                        tbl_key=''),
+                         '(usr:User)-[rel:READ]->(tbl:Table)')
+        with self.assertRaises(NotImplementedError):
+            Neo4jProxy._get_user_table_relationship_clause(relation_type='unknown')  # type: ignore
+
+    def test_resource_relation_by_user_queries_are_parameterized(self) -> None:
+        with patch.object(GraphDatabase, 'driver') as mock_driver:
+            mock_transaction = mock_driver.return_value.session.return_value.begin_transaction.return_value
+
+            neo4j_proxy = Neo4jProxy(host='DOES_NOT_MATTER', port=0000)
+            neo4j_proxy.add_table_relation_by_user(table_uri='dummy_uri',
+                                                   user_email='tester',
+                                                   relation_type=UserResourceRel.follow)
+            neo4j_proxy.delete_table_relation_by_user(table_uri='dummy_uri',
+                                                      user_email='tester',
+                                                      relation_type=UserResourceRel.follow)
+
+            for call_args in mock_transaction.run.call_args_list:
+                statement, params = call_args[0]
+                # the values are only passed as parameters so that the query plan can be cached
+                self.assertNotIn('dummy_uri', statement)
+                self.assertNotIn('tester', statement)
+                self.assertEqual(params['user_email'], 'tester')
+
+    def test_add_resource_relations_by_user(self) -> None:
+        with patch.object(GraphDatabase, 'driver') as mock_driver:
+            mock_session = MagicMock()
+            mock_driver.return_value.session.return_value = mock_session
+
+            mock_transaction = MagicMock()
+            mock_session.begin_transaction.return_value = mock_transaction
+
+            mock_run = MagicMock()
+            mock_run.return_value = [{'tbl_key': 'dummy_uri1'}, {'tbl_key': 'dummy_uri2'}]
+            mock_transaction.run = mock_run
+            mock_commit = MagicMock()
+            mock_transaction.commit = mock_commit
+
+            neo4j_proxy = Neo4jProxy(host='DOES_NOT_MATTER', port=0000)
+            neo4j_proxy.add_table_relations_by_user(table_uris=['dummy_uri1', 'dummy_uri2'],
+                                                    user_email='tester',
+                                                    relation_type=UserResourceRel.follow)
+            # one upsert for the user and one UNWIND query for all the relations
+            self.assertEquals(mock_run.call_count, 2)
+            self.assertEquals(mock_commit.call_count, 1)
+
+    def test_add_resource_relations_by_user_with_missing_table(self) -> None:
+        with patch.object(GraphDatabase, 'driver') as mock_driver:
+            mock_session = MagicMock()
+            mock_driver.return_value.session.return_value = mock_session
+
+            mock_transaction = MagicMock()
+            mock_transaction.closed.return_value = False
+            mock_session.begin_transaction.return_value = mock_transaction
+
+            mock_transaction.run.return_value = [{'tbl_key': 'dummy_uri1'}]
+
+            neo4j_proxy = Neo4jProxy(host='DOES_NOT_MATTER', port=0000)
+            self.assertRaises(RuntimeError, neo4j_proxy.add_table_relations_by_user,
+                              table_uris=['dummy_uri1', 'dummy_uri2'],
+                              user_email='tester',
+                              relation_type=UserResourceRel.follow)
+            self.assertEquals(mock_transaction.commit.call_count, 0)
+            self.assertEquals(mock_transaction.rollback.call_count, 1)
+
+    def test_delete_resource_relations_by_user(self) -> None:
+        with patch.object(GraphDatabase, 'driver') as mock_driver:
+            mock_session = MagicMock()
+            mock_driver.return_value.session.return_value = mock_session
+
+            mock_transaction = MagicMock()
+            mock_session.begin_transaction.return_value = mock_transaction
+
+            mock_run = MagicMock()
+            mock_transaction.run = mock_run
+            mock_commit = MagicMock()
+            mock_transaction.commit = mock_commit
+
+            neo4j_proxy = Neo4jProxy(host='DOES_NOT_MATTER', port=0000)
+            neo4j_proxy.delete_owners(table_uris=['dummy_uri1', 'dummy_uri2'],
+                                      owner='tester')
+            # a single UNWIND query deletes all the relations
+            self.assertEquals(mock_run.call_count, 1)
+            self.assertEquals(mock_commit.call_count, 1)
+
+    def test_ensure_indexes(self) -> None:
+        with patch.object(GraphDatabase, 'driver') as mock_driver:
+            mock_session = mock_driver.return_value.session.return_value.__enter__.return_value
+
+            Neo4jProxy(host='DOES_NOT_MATTER', port=0000)
+
+            queries = [call_args[0][0] for call_args in mock_session.run.call_args_list]
+            self.assertEqual(queries, ['CREATE CONSTRAINT ON (usr:User) ASSERT usr.key IS UNIQUE',
+                                       'CREATE CONSTRAINT ON (tbl:Table) ASSERT tbl.key IS UNIQUE'])
+
+    def test_ensure_indexes_failure_is_not_fatal(self) -> None:
+        with patch.object(GraphDatabase, 'driver') as mock_driver:
+            mock_session = mock_driver.return_value.session.return_value.__enter__.return_value
+            mock_session.run.side_effect = RuntimeError('Permission denied')
+
+            # does not raise
+            Neo4jProxy(host='DOES_NOT_MATTER', port=0000)
+            self.assertEqual(mock_session.run.call_count, 2)
+
     def test_get_invalid_user(self) -> None:
         with patch.object(GraphDatabase, 'driver'), patch.object(Neo4jProxy, '_execute_cypher_query') as mock_execute:
             mock_execute.return_value.single.return_value = None
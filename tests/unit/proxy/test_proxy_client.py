@@ -0,0 +1,49 @@
+import unittest
+
+from mock import patch
+from neo4j.v1 import GraphDatabase
+
+import metadata_service.proxy
+from metadata_service import create_app
+from metadata_service.proxy import get_proxy_client
+
+
+class TestGetProxyClient(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.app = create_app(config_module_class='metadata_service.config.LocalConfig')
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+
+    def tearDown(self) -> None:
+        self.app_context.pop()
+
+    def test_client_is_created_once(self) -> None:
+        with patch.object(metadata_service.proxy, '_proxy_client', None), \
+                patch.object(GraphDatabase, 'driver') as mock_driver:
+            first_client = get_proxy_client()
+            second_client = get_proxy_client()
+
+        self.assertIs(first_client, second_client)
+        mock_driver.assert_called_once()
+
+    def test_neo4j_connection_pool_config(self) -> None:
+        self.app.config['PROXY_CLIENT_KWARGS'] = {'num_conns': 100, 'connection_acquisition_timeout_sec': 5.0}
+
+        with patch.object(metadata_service.proxy, '_proxy_client', None), \
+                patch.object(GraphDatabase, 'driver') as mock_driver:
+            get_proxy_client()
+
+        _, driver_kwargs = mock_driver.call_args
+        self.assertEqual(driver_kwargs['max_connection_pool_size'], 100)
+        self.assertEqual(driver_kwargs['connection_acquisition_timeout'], 5.0)
+
+    def test_neo4j_connection_pool_default_config(self) -> None:
+        with patch.object(metadata_service.proxy, '_proxy_client', None), \
+                patch.object(GraphDatabase, 'driver') as mock_driver:
+            get_proxy_client()
+
+        _, driver_kwargs = mock_driver.call_args
+        self.assertEqual(driver_kwargs['max_connection_pool_size'], self.app.config['NEO4J_MAX_CONNECTION_POOL_SIZE'])
+        self.assertEqual(driver_kwargs['connection_acquisition_timeout'],
+                         self.app.config['NEO4J_CONNECTION_ACQUISITION_TIMEOUT'])
@@ -0,0 +1,114 @@
+import unittest
+
+from mock import MagicMock, call, patch
+from neo4j.v1 import GraphDatabase
+
+from metadata_service import create_app
+from metadata_service.proxy.neo4j_proxy import Neo4jProxy
+from metadata_service.proxy.write_coalescer import WriteCoalescer, get_write_coalescer
+from metadata_service.util import UserResourceRel
+from tests.unit.test_basics import BasicTestCase
+
+
+class TestWriteCoalescer(unittest.TestCase):
+
+    def setUp(self) -> None:
+        # no app context is pushed: the coalescer pushes its own, like on its background thread
+        self.app = create_app(config_module_class='metadata_service.config.LocalConfig')
+        self.mock_client = MagicMock()
+        # long interval so that the tests flush explicitly
+        self.write_coalescer = WriteCoalescer(app=self.app, client=self.mock_client,
+                                              flush_interval_sec=60, max_batch_size=2)
+
+    def tearDown(self) -> None:
+        self.write_coalescer.stop()
+
+    def test_flush_batches_by_user(self) -> None:
+        on_done = MagicMock()
+        for table_uri in ('table1', 'table2', 'table3'):
+            self.write_coalescer.add_table_relation_by_user(table_uri=table_uri,
+                                                            user_email='user1',
+                                                            relation_type=UserResourceRel.follow,
+                                                            on_done=on_done)
+        self.write_coalescer.delete_table_relation_by_user(table_uri='table1',
+                                                           user_email='user2',
+                                                           relation_type=UserResourceRel.follow)
+        self.write_coalescer.flush()
+
+        self.mock_client.add_table_relations_by_user.assert_has_calls([
+            call(table_uris=['table1', 'table2'], user_email='user1', relation_type=UserResourceRel.follow),
+            call(table_uris=['table3'], user_email='user1', relation_type=UserResourceRel.follow),
+        ])
+        self.mock_client.delete_table_relations_by_user.assert_called_once_with(
+            table_uris=['table1'], user_email='user2', relation_type=UserResourceRel.follow)
+        self.assertEqual(on_done.call_count, 3)
+
+    def test_flush_keeps_last_write(self) -> None:
+        self.write_coalescer.add_table_relation_by_user(table_uri='table1',
+                                                        user_email='user1',
+                                                        relation_type=UserResourceRel.follow)
+        self.write_coalescer.delete_table_relation_by_user(table_uri='table1',
+                                                           user_email='user1',
+                                                           relation_type=UserResourceRel.follow)
+        self.write_coalescer.flush()
+
+        self.mock_client.add_table_relations_by_user.assert_not_called()
+        self.mock_client.delete_table_relations_by_user.assert_called_once_with(
+            table_uris=['table1'], user_email='user1', relation_type=UserResourceRel.follow)
+
+    def test_flush_retries_failed_batch_one_by_one(self) -> None:
+        self.mock_client.add_table_relations_by_user.side_effect = RuntimeError()
+        self.mock_client.add_table_relation_by_user.side_effect = [RuntimeError(), None]
+        for table_uri in ('table1', 'table2'):
+            self.write_coalescer.add_table_relation_by_user(table_uri=table_uri,
+                                                            user_email='user1',
+                                                            relation_type=UserResourceRel.follow)
+        self.write_coalescer.flush()
+
+        self.mock_client.add_table_relation_by_user.assert_has_calls([
+            call(table_uri='table1', user_email='user1', relation_type=UserResourceRel.follow),
+            call(table_uri='table2', user_email='user1', relation_type=UserResourceRel.follow),
+        ])
+
+    def test_stop_flushes(self) -> None:
+        write_coalescer = WriteCoalescer(app=self.app, client=self.mock_client, flush_interval_sec=60)
+        write_coalescer.add_table_relation_by_user(table_uri='table1',
+                                                   user_email='user1',
+                                                   relation_type=UserResourceRel.own)
+        write_coalescer.stop()
+
+        self.mock_client.add_table_relations_by_user.assert_called_once_with(
+            table_uris=['table1'], user_email='user1', relation_type=UserResourceRel.own)
+
+    def test_flush_through_neo4j_proxy(self) -> None:
+        with patch.object(GraphDatabase, 'driver') as mock_driver:
+            mock_transaction = mock_driver.return_value.session.return_value.begin_transaction.return_value
+            mock_transaction.run.return_value = [{'tbl_key': 'table1'}]
+
+            write_coalescer = WriteCoalescer(app=self.app,
+                                             client=Neo4jProxy(host='DOES_NOT_MATTER', port=0000),
+                                             flush_interval_sec=60)
+            write_coalescer.add_table_relation_by_user(table_uri='table1',
+                                                       user_email='user1',
+                                                       relation_type=UserResourceRel.follow)
+            # flushed by the background thread, outside of any app context of the test
+            write_coalescer.stop()
+
+            self.assertEqual(mock_transaction.commit.call_count, 1)
+
+
+class TestGetWriteCoalescer(BasicTestCase):
+
+    def test_disabled_by_default(self) -> None:
+        self.assertIsNone(get_write_coalescer())
+
+    @patch('metadata_service.proxy.write_coalescer._write_coalescer', None)
+    @patch('metadata_service.proxy.write_coalescer.WriteCoalescer')
+    @patch('metadata_service.proxy.write_coalescer.get_proxy_client')
+    def test_singleton(self, mock_get_proxy_client: MagicMock, mock_write_coalescer: MagicMock) -> None:
+        self.app.config['USER_RELATION_WRITE_COALESCING'] = True
+
+        self.assertIs(get_write_coalescer(), get_write_coalescer())
+        mock_write_coalescer.assert_called_once_with(app=self.app,
+                                                     client=mock_get_proxy_client.return_value,
+                                                     flush_interval_sec=0.02)
@@ -0,0 +1,74 @@
+import unittest
+
+from mock import MagicMock, patch
+
+from metadata_service import cache
+
+
+class TestCache(unittest.TestCase):
+
+    def setUp(self) -> None:
+        cache.clear()
+
+    def test_cached_call(self) -> None:
+        createfunc = MagicMock(return_value={'table': []})
+
+        self.assertEqual(cache.cached_call(namespace=cache.USER_FOLLOW, key='username', createfunc=createfunc),
+                         {'table': []})
+        self.assertEqual(cache.cached_call(namespace=cache.USER_FOLLOW, key='username', createfunc=createfunc),
+                         {'table': []})
+        self.assertEqual(createfunc.call_count, 1)
+
+        # namespaces and keys are cached independently
+        cache.cached_call(namespace=cache.USER_OWN, key='username', createfunc=createfunc)
+        cache.cached_call(namespace=cache.USER_FOLLOW, key='other_username', createfunc=createfunc)
+        self.assertEqual(createfunc.call_count, 3)
+
+    def test_invalidate(self) -> None:
+        createfunc = MagicMock(return_value={'table': []})
+
+        cache.cached_call(namespace=cache.USER_FOLLOW, key='username', createfunc=createfunc)
+        cache.invalidate(namespace=cache.USER_FOLLOW, key='username')
+        cache.cached_call(namespace=cache.USER_FOLLOW, key='username', createfunc=createfunc)
+        self.assertEqual(createfunc.call_count, 2)
+
+    def test_exception_is_not_cached(self) -> None:
+        createfunc = MagicMock(side_effect=[RuntimeError(), {'table': []}])
+
+        self.assertRaises(RuntimeError, cache.cached_call,
+                          namespace=cache.USER_READ, key='username', createfunc=createfunc)
+        self.assertEqual(cache.cached_call(namespace=cache.USER_READ, key='username', createfunc=createfunc),
+                         {'table': []})
+
+    def test_none_is_not_cached(self) -> None:
+        createfunc = MagicMock(return_value=None)
+
+        cache.cached_call(namespace=cache.USER_FOLLOW, key='unknown', createfunc=createfunc)
+        cache.cached_call(namespace=cache.USER_FOLLOW, key='unknown', createfunc=createfunc)
+        self.assertEqual(createfunc.call_count, 2)
+        self.assertEqual(len(cache._CACHE), 0)
+
+    @patch('metadata_service.cache._USER_RESOURCE_CACHE_MAXSIZE', 2)
+    def test_least_recently_used_is_evicted(self) -> None:
+        createfunc = MagicMock(return_value={'table': []})
+
+        for key in ('user1', 'user2', 'user1', 'user3'):
+            cache.cached_call(namespace=cache.USER_FOLLOW, key=key, createfunc=createfunc)
+        self.assertEqual(list(cache._CACHE), [(cache.USER_FOLLOW, 'user1'), (cache.USER_FOLLOW, 'user3')])
+
+    def test_expired_value_is_recreated(self) -> None:
+        createfunc = MagicMock(return_value={'table': []})
+
+        with patch('metadata_service.cache.time.monotonic', return_value=0):
+            cache.cached_call(namespace=cache.USER_FOLLOW, key='username', createfunc=createfunc)
+        with patch('metadata_service.cache.time.monotonic', return_value=cache._USER_RESOURCE_CACHE_EXPIRY_SEC):
+            cache.cached_call(namespace=cache.USER_FOLLOW, key='username', createfunc=createfunc)
+        self.assertEqual(createfunc.call_count, 2)
+
+    def test_value_created_during_invalidation_is_not_cached(self) -> None:
+        def createfunc() -> dict:
+            cache.invalidate(namespace=cache.USER_FOLLOW, key='username')
+            return {'table': []}
+
+        cache.cached_call(namespace=cache.USER_FOLLOW, key='username', createfunc=createfunc)
+        self.assertEqual(len(cache._CACHE), 0)
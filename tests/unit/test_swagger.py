@@ -1,3 +1,4 @@
+import re
 import unittest
 
 from typing import Any, Dict
@@ -55,7 +56,8 @@ class TestSwagger(unittest.TestCase):
 
         paths_in_swagger = response.json.get('paths').keys()
         for endpoint in [rule.rule for rule in self.app.url_map.iter_rules()]:
-            endpoint = endpoint.replace('<path:', '{').replace('<', '{').replace('>', '}')
+            # e.g. <path:user_id> and <any(follow, own):relation> become {user_id} and {relation}
+            endpoint = re.sub(r'<(?:[^<>]*:)?([^<>]*)>', r'{\1}', endpoint)
             if endpoint not in paths_excluded_from_swagger and endpoint not in paths_in_swagger:
                 self.fail(f'The following endpoint is not in swagger: {endpoint}')
 